@@ -0,0 +1,41 @@
+from typing import Literal, Optional
+from fastapi import Header, Query, Response, status
+from fastapi.routing import APIRouter
+
+from penstan import charts
+from penstan.api.endpoints.volume.router import IntervalParam, PeriodParam, cached_result, get_bars_entry, result_etag
+from penstan.cache import cache_headers, etag_matches
+
+router = APIRouter()
+
+MEDIA_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+@router.get('/{symbol}', response_class=Response, responses={
+    200: {'content': {t: {} for t in MEDIA_TYPES.values()}, 'description': 'The analysis panels of one symbol'},
+})
+async def chart(
+    symbol: str,
+    interval: IntervalParam = '5m',
+    period: PeriodParam = '5d',
+    window: int = Query(16, ge=2),
+    format: Literal['png', 'svg'] = 'png',
+    width: float = Query(16, ge=4, le=40, description='Inches'),
+    height: float = Query(25, ge=4, le=60, description='Inches'),
+    dpi: int = Query(100, ge=50, le=300),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    The analysis.get_metrics panels for one interval, rendered off the event
+    loop in the chart pool. Images are cached per last bar and parameters
+    until the bar closes.
+    """
+    entry = await get_bars_entry(symbol, interval, period)
+    params = {'interval': interval, 'period': period, 'window': window, 'format': format, 'width': width, 'height': height, 'dpi': dpi}
+    etag = result_etag('chart', [entry], params)
+    headers = cache_headers(etag, [entry])
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    df = entry.value.to_frame()[['Open', 'High', 'Low', 'Close', 'Volume']]
+    image = await cached_result(etag, [entry], lambda: charts.render(df, window, format, width, height, dpi))
+    return Response(content=image, media_type=MEDIA_TYPES[format], headers=headers)
@@ -0,0 +1,75 @@
+from typing import Literal, Optional
+from fastapi import Header, HTTPException, Query, Response, status
+from fastapi.routing import APIRouter
+
+from penstan.api.endpoints.volume.router import IntervalParam, PeriodParam, cached_result, get_bars_entry, result_etag
+from penstan.cache import cache_headers, etag_matches, make_etag
+from penstan.compute import run_blocking
+from penstan.encoding import ENCODERS, Columns, available, compress, negotiate_encoding, negotiate_type, to_columns
+from penstan.fetch import Bars
+from penstan.settings import get_settings
+from pstan.scan import default_processors
+from pstan.utils.pipe import pipe
+
+router = APIRouter()
+
+def compute_columns(bars: Bars, window: int, names: list[str]) -> Columns:
+    df, _ = pipe(bars.to_frame()[['Open', 'High', 'Low', 'Close', 'Volume']], **default_processors(window))
+    columns = to_columns(df, bars.index)
+    if names:
+        columns = {k: v for k, v in columns.items() if k == 'time' or k in names}
+    return columns
+
+def encode(columns: Columns, meta: dict, media_type: str, encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+    return compress(ENCODERS[media_type](columns, meta), encoding, get_settings().COMPRESS_MIN_BYTES)
+
+@router.get('/{symbol}', response_class=Response, responses={
+    200: {'content': {t: {} for t in available()}, 'description': 'Indicator series, one array per column'},
+    406: {'description': 'None of the accepted formats is supported'},
+})
+async def indicators(
+    symbol: str,
+    interval: IntervalParam = '5m',
+    period: PeriodParam = '5d',
+    window: int = Query(16, ge=2),
+    columns: Optional[str] = Query(None, description='Comma separated, default all'),
+    format: Optional[Literal['json', 'arrow', 'binary']] = Query(None, description='Overrides the Accept header'),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Processed indicator series in a columnar layout: JSON arrays per column,
+    Arrow IPC (when pyarrow is installed) or the compact binary layout,
+    picked by Accept (or `format`) and compressed per Accept-Encoding.
+    """
+    media_type = negotiate_type(accept, format)
+    if media_type is None:
+        raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail=f'Supported: {", ".join(available())}')
+    encoding = negotiate_encoding(accept_encoding)
+
+    entry = await get_bars_entry(symbol, interval, period)
+    names = list(dict.fromkeys(c.strip() for c in (columns or '').split(',') if c.strip()))
+    key = result_etag('indicators', [entry], {'interval': interval, 'period': period, 'window': window, 'columns': names})
+
+    # One ETag per representation, the data one is shared by all of them
+    etag = make_etag(key, media_type, encoding)
+    headers = {**cache_headers(etag, [entry]), 'Vary': 'Accept, Accept-Encoding'}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    async def body() -> tuple[bytes, Optional[str]]:
+        data = await cached_result(key, [entry], lambda: run_blocking(compute_columns, entry.value, window, names))
+        meta = {
+            'symbol': entry.value.symbol,
+            'interval': interval,
+            'period': period,
+            'window': window,
+            'rows': len(data['time']),
+        }
+        return await run_blocking(encode, data, meta, media_type, encoding)
+
+    content, content_encoding = await cached_result(etag, [entry], body)
+    if content_encoding is not None:
+        headers['Content-Encoding'] = content_encoding
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -0,0 +1,75 @@
+import asyncio
+import json
+from typing import AsyncIterator
+from fastapi import Query, WebSocket
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRouter
+
+from penstan.live import ClientQueue, get_hub
+from penstan.settings import get_settings
+
+router = APIRouter()
+
+def _symbols(raw) -> list[str]:
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    return list(dict.fromkeys(s.strip().upper() for s in raw or [] if s.strip()))
+
+@router.websocket('/ws')
+async def live_ws(websocket: WebSocket) -> None:
+    """
+    Send {"subscribe": [...]} / {"unsubscribe": [...]} at any time; every
+    server frame is a JSON list of messages (bar, indicators, signal,
+    error) that were pending for this client.
+    """
+    await websocket.accept()
+    settings = get_settings()
+    hub = get_hub()
+    client = ClientQueue(settings.LIVE_CLIENT_QUEUE)
+
+    async def receive() -> None:
+        while True:
+            command = await websocket.receive_json()
+            if 'subscribe' in command:
+                hub.subscribe(client, _symbols(command['subscribe']))
+            if 'unsubscribe' in command:
+                hub.unsubscribe(client, _symbols(command['unsubscribe']))
+
+    async def send() -> None:
+        while True:
+            batch = await client.get()
+            await websocket.send_json(batch)
+
+    tasks = [asyncio.create_task(receive()), asyncio.create_task(send())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        hub.unsubscribe(client)
+
+async def sse_lines(symbols: list[str]) -> AsyncIterator[str]:
+    settings = get_settings()
+    hub = get_hub()
+    client = ClientQueue(settings.LIVE_CLIENT_QUEUE)
+    hub.subscribe(client, symbols)
+    try:
+        while True:
+            try:
+                batch = await asyncio.wait_for(client.get(), settings.LIVE_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            for message in batch:
+                yield f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+    finally:
+        hub.unsubscribe(client)
+
+@router.get('/sse')
+async def live_sse(symbols: str = Query(..., description='Comma separated symbols')) -> StreamingResponse:
+    return StreamingResponse(
+        sse_lines(_symbols(symbols)),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
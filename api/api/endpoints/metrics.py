@@ -0,0 +1,12 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from pstan.utils import metrics
+
+router = APIRouter()
+
+@router.get('', response_class=PlainTextResponse)
+async def prometheus() -> PlainTextResponse:
+    if not metrics.REGISTRY.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Metrics are disabled')
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type='text/plain; version=0.0.4')
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+from penstan.fetch import Interval, Period
+
+class ScanRequest(BaseModel):
+    symbols: list[str] = Field(..., min_length=1)
+    interval: Interval.__value__ = '1h'
+    period: Period.__value__ = '5d'
+    lookback: int = Field(20, ge=2)
+    recent: int = Field(5, ge=1)
+    local: bool = False
+    concurrency: int = Field(8, ge=1, description='Symbols in flight, capped by SCAN_CONCURRENCY')
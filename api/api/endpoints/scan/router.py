@@ -0,0 +1,69 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator
+from fastapi import Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRouter
+
+from penstan.api.endpoints.scan.models import ScanRequest
+from penstan.api.endpoints.volume.router import get_bars
+from penstan.compute import run_blocking
+from penstan.fetch import opportunity_score
+from penstan.settings import Settings, get_settings
+
+router = APIRouter()
+
+async def _scan_one(index: int, symbol: str, req: ScanRequest) -> dict:
+    start = time.perf_counter()
+    try:
+        bars = await get_bars(symbol, req.interval, req.period)
+        result = await run_blocking(opportunity_score, bars, req.lookback, req.recent, req.local)
+        row = {'symbol': bars.symbol, 'as_of': bars.index[-1].isoformat(), **result}
+    except HTTPException as e:
+        row = {'symbol': symbol.upper(), 'error': e.detail}
+    except Exception as e:
+        row = {'symbol': symbol.upper(), 'error': repr(e)}
+    return {'index': index, **row, 'elapsed_ms': round((time.perf_counter() - start) * 1e3, 1)}
+
+async def scan_lines(req: ScanRequest, concurrency: int) -> AsyncIterator[str]:
+    """
+    NDJSON lines in completion order. `concurrency` workers pull symbols
+    from a shared iterator, so at most that many are in flight; results go
+    through a queue of the same size, so a slow reader stalls the workers
+    instead of buffering the whole scan. Closing the generator (client
+    gone) cancels whatever is still running.
+
+    Plain tasks rather than a TaskGroup: a failing child would cancel the
+    response task mid-stream, while here per-symbol errors become lines.
+    """
+    symbols = iter(enumerate(req.symbols))
+    queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=concurrency)
+
+    async def worker() -> None:
+        for index, symbol in symbols:
+            await queue.put(await _scan_one(index, symbol, req))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(req.symbols)))]
+    try:
+        for _ in range(len(req.symbols)):
+            yield json.dumps(await queue.get(), default=str) + '\n'
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+@router.post('')
+async def scan(req: ScanRequest, settings: Settings = Depends(get_settings)) -> StreamingResponse:
+    if len(req.symbols) > settings.SCAN_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'At most {settings.SCAN_MAX_SYMBOLS} symbols per scan',
+        )
+    req.symbols = list(dict.fromkeys(s.strip().upper() for s in req.symbols if s.strip()))
+
+    return StreamingResponse(
+        scan_lines(req, min(req.concurrency, settings.SCAN_CONCURRENCY)),
+        media_type='application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no'},  # Don't let proxies hold lines back
+    )
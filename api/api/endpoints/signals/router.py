@@ -0,0 +1,22 @@
+from datetime import timedelta
+from typing import Optional
+from fastapi import Query
+from fastapi.routing import APIRouter
+
+from pstan.signalstore import get_signal_store
+
+router = APIRouter()
+
+@router.get('')
+async def recent_signals(
+    minutes: float = Query(30, gt=0, description='Look-back window'),
+    signal: Optional[list[str]] = Query(None, description='Only these signals'),
+    symbol: Optional[list[str]] = Query(None, description='Only these symbols'),
+) -> list[dict]:
+    events = get_signal_store().recent(timedelta(minutes=minutes), signals=signal, symbols=symbol)
+    events['time'] = events['time'].map(lambda t: t.isoformat())
+    return events.to_dict(orient='records')
+
+@router.get('/fired/{signal}')
+async def fired(signal: str, minutes: float = Query(30, gt=0)) -> list[str]:
+    return get_signal_store().fired(signal, timedelta(minutes=minutes))
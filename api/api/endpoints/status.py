@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from penstan.scheduler import get_scheduler
 from penstan.settings import Settings, get_settings
 
 router = APIRouter()
@@ -8,5 +9,6 @@ async def status(settings: Settings = Depends(get_settings)) -> dict:
     return {
         'healthy': True,
         'app_version': settings.APP_VERSION,
+        'scheduler': get_scheduler().stats if get_scheduler() else None,
     }
 
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel
+
+Trend = Literal['increasing', 'decreasing', 'stable']
+Rating = Literal['strong_buy', 'buy', 'watch', 'pass']
+
+class BarsInfo(BaseModel):
+    symbol: str
+    interval: str
+    period: str
+    bars: int
+    as_of: datetime  # Open time of the last bar
+
+class VolumeAnalysis(BaseModel):
+    current_volume: int
+    avg_volume_all: int
+    avg_volume_back: int
+    avg_volume_recent: int
+    volume_ratio_global: float
+    volume_ratio_local: float
+    volume_trend: Trend
+    is_spike: bool
+
+class VolumeResponse(BarsInfo):
+    volume: VolumeAnalysis
+
+class ScoreResponse(BarsInfo):
+    score: int
+    rating: Rating
+    signals: list[str]
+
+class ScoreRow(BaseModel):
+    symbol: str
+    score: int
+    rating: Rating
+    signals: list[str]
+    current_price: float
+    current_volume: int
+    volume_ratio_global: float
+    volume_ratio_local: float
+    momentum_ratio: float
+    price_gradient: float
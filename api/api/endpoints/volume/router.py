@@ -1,7 +1,174 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+from fastapi import Header, HTTPException, Query, Response, status
 from fastapi.routing import APIRouter
 
+from penstan.cache import Entry, bar_expiry, cache_headers, etag_matches, get_bars_cache, get_results_cache, make_etag
+from penstan.compute import run_blocking
+from penstan.fetch import Bars, Interval, Period, analyze_volume, decode_signals, fetch_data, opportunity_score, opportunity_scores
+from penstan.api.endpoints.volume.models import ScoreResponse, ScoreRow, VolumeResponse
+
 router = APIRouter()
 
-@router.get('')
-async def status():
-    return 'hello'
+# Query parameters need the Literal itself, not the `type` alias
+IntervalParam = Interval.__value__
+PeriodParam = Period.__value__
+
+# Endpoint defaults, shared with the scheduler so it warms the keys requests read
+VOLUME_INTERVAL = '5m'
+SCORE_INTERVAL = '1h'
+PERIOD = '5d'
+LOOKBACK = 20
+RECENT = 5
+
+def _fetch_one(symbol: str, interval: str, period: str) -> Bars:
+    bars = fetch_data([symbol], interval, period).get(symbol)
+    if bars is None:
+        # Raised rather than returned so misses (often transient) aren't cached
+        raise LookupError(symbol)
+    return bars
+
+def _describe(bars: Bars) -> dict:
+    return {'last_bar': bars.index[-1].isoformat(), 'bars': len(bars)}
+
+async def get_bars_entry(symbol: str, interval: str, period: str) -> Entry:
+    """Cache entry with one symbol's bars, valid until the current bar closes"""
+    symbol = symbol.upper()
+    try:
+        return await get_bars_cache().get_or_compute(
+            ('bars', symbol, interval, period),
+            lambda: run_blocking(_fetch_one, symbol, interval, period),
+            bar_expiry(interval),
+            _describe,
+        )
+    except LookupError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'No data for {symbol}')
+
+async def get_bars(symbol: str, interval: str, period: str) -> Bars:
+    return (await get_bars_entry(symbol, interval, period)).value
+
+def result_etag(route: str, entries: list[Entry], params: dict) -> str:
+    """ETag over the route, parameters and each symbol's last bar"""
+    return make_etag(route, params, [(e.value.symbol, e.meta['last_bar']) for e in entries])
+
+def conditional(etag: str, entries: list[Entry], if_none_match: Optional[str], response: Response) -> Optional[Response]:
+    """A bare 304 for a matching If-None-Match, before anything is computed"""
+    headers = cache_headers(etag, entries)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+async def cached_result(etag: str, entries: list[Entry], compute: Callable[[], Awaitable]):
+    """Computed once per ETag (by a request or the scheduler) until its bars expire"""
+    expires = min(e.expires for e in entries) if entries else 0.0
+    entry = await get_results_cache().get_or_compute(etag, compute, lambda: expires)
+    return entry.value
+
+def _info(bars: Bars, interval: str, period: str) -> dict:
+    return {
+        'symbol': bars.symbol,
+        'interval': interval,
+        'period': period,
+        'bars': len(bars),
+        'as_of': bars.index[-1].to_pydatetime(),
+    }
+
+@router.get('', response_model=list[ScoreRow])
+async def scores(
+    response: Response,
+    symbols: str = Query(..., description='Comma separated symbols'),
+    interval: IntervalParam = SCORE_INTERVAL,
+    period: PeriodParam = PERIOD,
+    lookback: int = Query(LOOKBACK, ge=2),
+    recent: int = Query(RECENT, ge=1),
+    local: bool = False,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Scores for several symbols. Symbols without data are left out and
+    listed in the X-Missing-Symbols header; any other failure fails the request.
+    """
+    names = list(dict.fromkeys(s.strip().upper() for s in symbols.split(',') if s.strip()))
+    results = await asyncio.gather(*(get_bars_entry(s, interval, period) for s in names), return_exceptions=True)
+
+    entries, missing = [], []
+    for name, result in zip(names, results):
+        if isinstance(result, HTTPException) and result.status_code == status.HTTP_404_NOT_FOUND:
+            missing.append(name)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            entries.append(result)
+    if not entries:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'No data for {", ".join(missing)}')
+
+    etag = result_etag('scores', entries, {'interval': interval, 'period': period, 'lookback': lookback, 'recent': recent, 'local': local, 'missing': missing})
+    not_modified = conditional(etag, entries, if_none_match, response)
+    if missing:
+        (response if not_modified is None else not_modified).headers['X-Missing-Symbols'] = ','.join(missing)
+    if not_modified is not None:
+        return not_modified
+
+    async def compute() -> list[ScoreRow]:
+        table = await run_blocking(opportunity_scores, [e.value for e in entries], lookback, recent, local)
+        return [
+            ScoreRow(symbol=symbol, signals=decode_signals(int(row['flags'])), **row.drop('flags').to_dict())
+            for symbol, row in table.iterrows()
+        ]
+
+    return await cached_result(etag, entries, compute)
+
+@router.get('/{symbol}', response_model=VolumeResponse)
+async def volume(
+    response: Response,
+    symbol: str,
+    interval: IntervalParam = VOLUME_INTERVAL,
+    period: PeriodParam = PERIOD,
+    lookback: int = Query(LOOKBACK, ge=2),
+    recent: int = Query(RECENT, ge=1),
+    if_none_match: Optional[str] = Header(None),
+):
+    entry = await get_bars_entry(symbol, interval, period)
+    etag = result_etag('volume', [entry], {'interval': interval, 'period': period, 'lookback': lookback, 'recent': recent})
+    if (not_modified := conditional(etag, [entry], if_none_match, response)) is not None:
+        return not_modified
+    return await cached_result(etag, [entry], lambda: volume_result(entry, interval, period, lookback, recent))
+
+async def volume_result(entry: Entry, interval: str, period: str, lookback: int, recent: int) -> VolumeResponse:
+    analysis = await run_blocking(analyze_volume, entry.value, lookback, recent)
+    return VolumeResponse(**_info(entry.value, interval, period), volume=analysis)
+
+@router.get('/{symbol}/score', response_model=ScoreResponse)
+async def score(
+    response: Response,
+    symbol: str,
+    interval: IntervalParam = SCORE_INTERVAL,
+    period: PeriodParam = PERIOD,
+    lookback: int = Query(LOOKBACK, ge=2),
+    recent: int = Query(RECENT, ge=1),
+    local: bool = False,
+    if_none_match: Optional[str] = Header(None),
+):
+    entry = await get_bars_entry(symbol, interval, period)
+    etag = result_etag('score', [entry], {'interval': interval, 'period': period, 'lookback': lookback, 'recent': recent, 'local': local})
+    if (not_modified := conditional(etag, [entry], if_none_match, response)) is not None:
+        return not_modified
+    return await cached_result(etag, [entry], lambda: score_result(entry, interval, period, lookback, recent, local))
+
+async def score_result(entry: Entry, interval: str, period: str, lookback: int, recent: int, local: bool) -> ScoreResponse:
+    result = await run_blocking(opportunity_score, entry.value, lookback, recent, local)
+    return ScoreResponse(**_info(entry.value, interval, period), **result)
+
+async def warm(symbol: str, interval: str, period: str = PERIOD) -> Entry:
+    """
+    Refresh bars and precompute the default-parameter responses of one
+    symbol, under the same keys a request for `interval` with the other
+    parameters left at their defaults reads
+    """
+    entry = await get_bars_entry(symbol, interval, period)
+    etag = result_etag('volume', [entry], {'interval': interval, 'period': period, 'lookback': LOOKBACK, 'recent': RECENT})
+    await cached_result(etag, [entry], lambda: volume_result(entry, interval, period, LOOKBACK, RECENT))
+    etag = result_etag('score', [entry], {'interval': interval, 'period': period, 'lookback': LOOKBACK, 'recent': RECENT, 'local': False})
+    await cached_result(etag, [entry], lambda: score_result(entry, interval, period, LOOKBACK, RECENT, False))
+    return entry
@@ -1,4 +1,9 @@
 from fastapi.routing import APIRouter
+from penstan.api.endpoints.charts import router as charts_router
+from penstan.api.endpoints.indicators import router as indicators_router
+from penstan.api.endpoints.live import router as live_router
+from penstan.api.endpoints.scan import router as scan_router
+from penstan.api.endpoints.signals import router as signals_router
 from penstan.api.endpoints.volume import router as volume_router
 
 api_router = APIRouter(prefix='/api')
@@ -9,3 +14,32 @@ api_router.include_router(
     tags=['volume'],
 )
 
+api_router.include_router(
+    indicators_router,
+    prefix='/indicators',
+    tags=['indicators'],
+)
+
+api_router.include_router(
+    charts_router,
+    prefix='/charts',
+    tags=['charts'],
+)
+
+api_router.include_router(
+    signals_router,
+    prefix='/signals',
+    tags=['signals'],
+)
+
+api_router.include_router(
+    scan_router,
+    prefix='/scan',
+    tags=['scan'],
+)
+
+api_router.include_router(
+    live_router,
+    prefix='/live',
+    tags=['live'],
+)
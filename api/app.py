@@ -1,15 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 
+from penstan.api.endpoints.metrics import router as metrics_router
 from penstan.api.endpoints.status import router as status_router
 from penstan.api.router import api_router
 from penstan.auth import api_key_dependency
+from penstan import charts, compute, live, monitoring, scheduler
 from penstan.settings import Settings, get_settings
 
 settings: Settings = get_settings()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    monitoring.start()
+    scheduler.start()
+    yield
+    await scheduler.stop()
+    await monitoring.stop()
+    await live.shutdown()
+    compute.shutdown()
+    charts.shutdown()
+
 def create_app() -> FastAPI:
     app = FastAPI(
+        lifespan=lifespan,
         title='Penstan',
         servers=[{
             'url': settings.SERVER_URL
@@ -19,6 +34,7 @@ def create_app() -> FastAPI:
 
     app.include_router(api_router, dependencies=[Depends(api_key_dependency)])
     app.include_router(status_router, prefix='/status')
+    app.include_router(metrics_router, prefix='/metrics')
 
     # Add CORS Middlewares
     app.add_middleware(
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, Optional
+import pandas as pd
+
+from penstan.settings import get_settings
+from pstan.sessions import SessionCalendar
+
+INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800,
+    '60m': 3600, '90m': 5400, '1h': 3600, '4h': 14400,
+}
+
+def next_bar_close(interval: str, now: Optional[float] = None, prepost: bool = False) -> float:
+    """
+    Epoch seconds when the bar open at `now` closes, from the exchange
+    calendar. Intraday bars are anchored to the start of their session
+    segment (09:30 for regular hours, so 1h bars close at 10:30, 11:30...)
+    and the last one is cut short at the segment's end. Outside trading
+    hours it's the first bar close of the next segment. Daily and slower
+    bars close at the next regular close. `prepost` adds the pre and post
+    market segments, each anchored to its own start.
+    """
+    now = time.time() if now is None else now
+    now_ts = pd.Timestamp(now, unit='s', tz='UTC')
+    sessions = SessionCalendar().sessions(now_ts - pd.Timedelta(days=1), now_ts + pd.Timedelta(days=10))
+
+    seconds = INTERVAL_SECONDS.get(interval)
+    if seconds is None:
+        closes = sessions['close']
+        upcoming = closes[closes > now_ts]
+        return upcoming.iloc[0].timestamp() if len(upcoming) else now + 86400
+
+    bounds = ['pre_open', 'open', 'close', 'post_close'] if prepost else ['open', 'close']
+    for row in sessions[bounds].itertuples(index=False):
+        edges = [t.timestamp() for t in row]
+        for start, end in zip(edges, edges[1:]):
+            if now < start:
+                return min(start + seconds, end)
+            if now < end:
+                return min(start + (math.floor((now - start) / seconds) + 1) * seconds, end)
+    return now + seconds
+
+@dataclass
+class Entry:
+    value: Any
+    created: float
+    expires: float
+    meta: dict = field(default_factory=dict)
+
+    @property
+    def ttl(self) -> float:
+        return max(0.0, self.expires - time.time())
+
+
+class TTLCache:
+    """
+    LRU-bounded cache of Entries that expire at an absolute time, with
+    single-flight fills: concurrent misses on one key share a single
+    computation, which keeps running even if the request that started it
+    is cancelled.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Entry] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, value: Any, expires: float, **meta) -> Entry:
+        entry = Entry(value=value, created=time.time(), expires=expires, meta=meta)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    async def _fill(self, key: Hashable, compute: Callable[[], Awaitable[Any]], expires: Callable[[], float], describe: Optional[Callable[[Any], dict]]) -> Entry:
+        value = await compute()
+        return self.set(key, value, expires(), **(describe(value) if describe else {}))
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        expires: Callable[[], float],
+        describe: Optional[Callable[[Any], dict]] = None,
+    ) -> Entry:
+        """`describe` derives Entry.meta from the value once, when it's stored"""
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(key, compute, expires, describe))
+            self._inflight[key] = task
+
+            def done(t: asyncio.Task) -> None:
+                self._inflight.pop(key, None)
+                if not t.cancelled():
+                    t.exception()  # Retrieved here so errors nobody awaited aren't logged as lost
+
+            task.add_done_callback(done)
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_bars_cache: Optional[TTLCache] = None
+
+def get_bars_cache() -> TTLCache:
+    global _bars_cache
+    if _bars_cache is None:
+        _bars_cache = TTLCache(get_settings().CACHE_MAX_ENTRIES)
+    return _bars_cache
+
+_results_cache: Optional[TTLCache] = None
+
+def get_results_cache() -> TTLCache:
+    """Computed responses keyed by their ETag, expiring with the bars they came from"""
+    global _results_cache
+    if _results_cache is None:
+        _results_cache = TTLCache(get_settings().CACHE_MAX_ENTRIES)
+    return _results_cache
+
+def bar_expiry(interval: str) -> Callable[[], float]:
+    grace = get_settings().CACHE_GRACE_SECONDS
+    return lambda: next_bar_close(interval) + grace
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over JSON-able parts (symbol, interval, last bar, params...)"""
+    digest = hashlib.blake2b(json.dumps(parts, sort_keys=True, default=str).encode(), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # Weak comparison, as If-None-Match requires
+    tags = {t.strip().removeprefix('W/') for t in if_none_match.split(',')}
+    return etag in tags
+
+def cache_headers(etag: str, entries: list[Entry]) -> dict[str, str]:
+    """ETag plus a max-age that runs out when the first of `entries` expires"""
+    max_age = int(min(e.ttl for e in entries)) if entries else 0
+    return {'ETag': etag, 'Cache-Control': f'private, max-age={max_age}'}
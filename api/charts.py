@@ -0,0 +1,59 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import pandas as pd
+from fastapi import HTTPException, status
+from penstan.settings import get_settings
+
+# Matplotlib isn't thread-safe and keeps global state, so charts render in
+# their own single-threaded processes, apart from the compute pool
+_executor: Optional[ProcessPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+
+def _init_worker() -> None:
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _render(df: pd.DataFrame, window: int, format: str, width: float, height: float, dpi: int) -> bytes:
+    # Imported here so the API process never loads pyplot
+    from pstan.analysis import render_metrics
+    return render_metrics(df, window, format, width, height, dpi)
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=get_settings().CHART_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+        )
+    return _executor
+
+def queue_depth() -> int:
+    return get_settings().CHART_QUEUE - _slots._value if _slots is not None else 0
+
+async def render(df: pd.DataFrame, window: int, format: str, width: float, height: float, dpi: int) -> bytes:
+    """Render the metrics panels of an OHLCV frame, 503 when CHART_QUEUE renders are already waiting"""
+    global _slots
+    settings = get_settings()
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.CHART_QUEUE)
+
+    try:
+        await asyncio.wait_for(_slots.acquire(), settings.COMPUTE_QUEUE_TIMEOUT)
+    except TimeoutError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail='Chart queue full')
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), _render, df, window, format, width, height, dpi)
+    finally:
+        _slots.release()
+
+def shutdown() -> None:
+    global _executor, _slots
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _slots = None
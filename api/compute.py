@@ -0,0 +1,54 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+from fastapi import HTTPException, status
+from penstan.settings import get_settings
+
+# pandas/yfinance calls block; they run here so the event loop keeps serving
+_executor: Optional[Executor] = None
+_slots: Optional[asyncio.Semaphore] = None
+
+def get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        if settings.COMPUTE_MODE == 'process':
+            _executor = ProcessPoolExecutor(max_workers=settings.COMPUTE_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=settings.COMPUTE_WORKERS, thread_name_prefix='compute')
+    return _executor
+
+def queue_depth() -> int:
+    """Calls currently running or waiting for a worker"""
+    return get_settings().COMPUTE_QUEUE - _slots._value if _slots is not None else 0
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking call in the compute pool. At most COMPUTE_QUEUE calls are
+    admitted at once; beyond that callers wait up to COMPUTE_QUEUE_TIMEOUT
+    and then get a 503, so overload sheds requests instead of growing an
+    unbounded backlog.
+    """
+    global _slots
+    settings = get_settings()
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.COMPUTE_QUEUE)
+
+    try:
+        await asyncio.wait_for(_slots.acquire(), settings.COMPUTE_QUEUE_TIMEOUT)
+    except TimeoutError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail='Compute queue full')
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+    finally:
+        _slots.release()
+
+def shutdown() -> None:
+    global _executor, _slots
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _slots = None
@@ -0,0 +1,188 @@
+import gzip
+import json
+import struct
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Column name -> 1-D array, all the same length, 'time' (int64 ns UTC) first
+type Columns = dict[str, np.ndarray]
+
+JSON = 'application/json'
+ARROW = 'application/vnd.apache.arrow.stream'
+BINARY = 'application/x-penstan-columns'
+
+# Short names for the `format` query parameter
+FORMATS = {'json': JSON, 'arrow': ARROW, 'binary': BINARY}
+
+def to_columns(df: pd.DataFrame, times: pd.DatetimeIndex) -> Columns:
+    """Numeric and boolean columns of a processed frame, keyed by name"""
+    columns = {'time': pd.DatetimeIndex(times).tz_convert('UTC').as_unit('ns').asi8}
+    for name in df.columns:
+        values = df[name]
+        if values.dtype == bool or pd.api.types.is_numeric_dtype(values.dtype):
+            columns[name] = values.to_numpy()
+    return columns
+
+def available() -> list[str]:
+    return [t for t in (JSON, ARROW, BINARY) if t != ARROW or pa is not None]
+
+def _accept(header: Optional[str]) -> list[tuple[str, float]]:
+    """Media ranges (or codings) with their q-values, best first"""
+    ranges = []
+    for part in (header or '').split(','):
+        name, *params = [p.strip() for p in part.split(';')]
+        if not name:
+            continue
+        q = 1.0
+        for p in params:
+            if p.startswith('q='):
+                try:
+                    q = float(p[2:])
+                except ValueError:
+                    q = 0.0
+        ranges.append((name.lower(), q))
+    return sorted(ranges, key=lambda r: -r[1])
+
+def negotiate_type(accept: Optional[str], format: Optional[str] = None) -> Optional[str]:
+    """Response media type: `format` if given, else the best acceptable one; None if nothing fits"""
+    supported = available()
+    if format is not None:
+        media_type = FORMATS.get(format)
+        return media_type if media_type in supported else None
+    if not accept:
+        return JSON
+
+    for name, q in _accept(accept):
+        if q <= 0:
+            continue
+        if name in ('*/*', 'application/*'):
+            return JSON
+        if name in supported:
+            return name
+    return None
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """zstd when available and accepted, then gzip; None for identity"""
+    accepted = {name: q for name, q in _accept(accept_encoding)}
+    wildcard = accepted.get('*', 0.0)
+    options = ['zstd', 'gzip'] if zstandard is not None else ['gzip']
+    ranked = sorted(options, key=lambda c: -accepted.get(c, wildcard))
+    best = ranked[0]
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+# --- Encoders
+
+def _json_values(values: np.ndarray) -> list:
+    # tolist() converts in C; NaN and ±inf become null, which JSON can represent
+    if values.dtype.kind == 'f':
+        missing = ~np.isfinite(values)
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+    return values.tolist()
+
+def encode_json(columns: Columns, meta: dict) -> bytes:
+    """
+    {"meta": {...}, "time": [epoch ms...], "columns": {name: [values...]}}
+
+    One array per column instead of one object per row: no repeated keys,
+    and whole arrays are converted at once rather than float by float.
+    """
+    time = columns['time'] // 1_000_000
+    rest = {k: v for k, v in columns.items() if k != 'time'}
+    if orjson is not None:
+        # Serialises numpy arrays natively, NaN and ±inf as null like _json_values
+        arrays = {k: v.astype(np.float64) if v.dtype.kind == 'f' else v for k, v in rest.items()}
+        return orjson.dumps({'meta': meta, 'time': time, 'columns': arrays}, option=orjson.OPT_SERIALIZE_NUMPY)
+    body = {'meta': meta, 'time': time.tolist(), 'columns': {k: _json_values(v) for k, v in rest.items()}}
+    return json.dumps(body, separators=(',', ':'), allow_nan=False).encode()
+
+def encode_arrow(columns: Columns, meta: dict) -> bytes:
+    """Arrow IPC stream of one record batch, `meta` in the schema metadata"""
+    arrays = {k: pa.array(v, from_pandas=True) for k, v in columns.items() if k != 'time'}
+    time = pa.array(columns['time'], type=pa.timestamp('ns', tz='UTC'))
+    batch = pa.RecordBatch.from_pydict({'time': time, **arrays}, metadata={'penstan': json.dumps(meta)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+_MAGIC = b'PSTC'
+
+def _compact(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind == 'f':
+        return values.astype('<f4')
+    if values.dtype.kind == 'b':
+        return values.astype(np.uint8)
+    return values.astype('<i8')
+
+def encode_binary(columns: Columns, meta: dict) -> bytes:
+    """
+    Compact columnar layout for clients without Arrow:
+
+        b'PSTC' | u32 header length | JSON header | padding | column buffers
+
+    The header lists rows and each column's name, dtype ('<i8' time and
+    integers, '<f4' floats with NaN for missing, 'u1' booleans) and byte
+    offset. Buffers are 8-byte aligned, so a browser can wrap each in a
+    TypedArray without copying.
+    """
+    buffers = [(k, columns[k].astype('<i8') if k == 'time' else _compact(columns[k])) for k in columns]
+    rows = len(columns['time'])
+
+    offset = 0
+    fields = []
+    for name, values in buffers:
+        fields.append({'name': name, 'dtype': values.dtype.str.replace('|', ''), 'offset': offset})
+        offset += -(-values.nbytes // 8) * 8
+
+    header = json.dumps({'meta': meta, 'rows': rows, 'columns': fields}, separators=(',', ':')).encode()
+    start = -(-(len(_MAGIC) + 4 + len(header)) // 8) * 8
+    out = bytearray(start + offset)
+    out[:4] = _MAGIC
+    out[4:8] = struct.pack('<I', len(header))
+    out[8:8 + len(header)] = header
+    for field, (_, values) in zip(fields, buffers):
+        a = start + field['offset']
+        out[a:a + values.nbytes] = values.tobytes()
+    return bytes(out)
+
+def decode_binary(data: bytes) -> tuple[dict, Columns]:
+    """(meta, columns) from encode_binary output"""
+    if data[:4] != _MAGIC:
+        raise ValueError('Not a penstan columns payload')
+    (length,) = struct.unpack('<I', data[4:8])
+    header = json.loads(data[8:8 + length])
+    start = -(-(8 + length) // 8) * 8
+    columns = {
+        f['name']: np.frombuffer(data, dtype=f['dtype'], count=header['rows'], offset=start + f['offset'])
+        for f in header['columns']
+    }
+    return header['meta'], columns
+
+ENCODERS = {JSON: encode_json, ARROW: encode_arrow, BINARY: encode_binary}
+
+def compress(body: bytes, encoding: Optional[str], min_bytes: int) -> tuple[bytes, Optional[str]]:
+    """(body, Content-Encoding); small bodies aren't worth compressing"""
+    if encoding is None or len(body) < min_bytes:
+        return body, None
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(body), 'zstd'
+    return gzip.compress(body, compresslevel=5, mtime=0), 'gzip'
@@ -1,10 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal
 import numpy as np
 import pandas as pd
 import yfinance as yf
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+
+from pstan.utils.metrics import timed_fetch
 
 type Period = Literal['1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max']
 type Interval = Literal['1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '4h', '1d', '5d', '1wk', '1mo', '3mo']
@@ -16,7 +17,80 @@ def set_timezone(dt_index: pd.DatetimeIndex, target_tz: str = "Etc/GMT-1") -> pd
     return dt_index
 
 
-def fetch_data(symbols: list[str], interval: Interval, period: Period, test: bool = False) -> dict[str, pd.DataFrame]:
+class Bars:
+    """
+    Struct-of-arrays OHLCV container for one symbol.
+
+    Per-row columns are contiguous numpy arrays; values that are constant
+    for the whole series (last price/volume) are held once as scalars.
+    """
+
+    __slots__ = (
+        'symbol', 'index', 'open', 'high', 'low', 'close', 'volume',
+        'volatility', 'change', 'current_price', 'current_volume',
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        index: pd.DatetimeIndex,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ):
+        self.symbol = symbol
+        self.index = index
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+        self.volatility = (high - low) / close * 100
+        self.change = (close - open) / open * 100
+
+        self.current_price = float(close[-1])
+        self.current_volume = int(volume[-1])
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, c).nbytes for c in ('open', 'high', 'low', 'close', 'volume', 'volatility', 'change'))
+
+    @classmethod
+    def from_frame(cls, symbol: str, df: pd.DataFrame) -> 'Bars':
+        # to_numpy(copy=False) returns views whenever the column dtype already matches
+        return cls(
+            symbol,
+            pd.DatetimeIndex(df.index),
+            df['Open'].to_numpy(dtype=np.float64, copy=False),
+            df['High'].to_numpy(dtype=np.float64, copy=False),
+            df['Low'].to_numpy(dtype=np.float64, copy=False),
+            df['Close'].to_numpy(dtype=np.float64, copy=False),
+            df['Volume'].to_numpy(dtype=np.int64, copy=False),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame({
+            'Open': self.open,
+            'High': self.high,
+            'Low': self.low,
+            'Close': self.close,
+            'Volume': self.volume,
+            'Volatility': self.volatility,
+            'Change': self.change,
+        }, index=self.index, copy=False)
+        df.attrs['current_price'] = self.current_price
+        df.attrs['current_volume'] = self.current_volume
+        return df
+
+
+@timed_fetch('yfinance')
+def fetch_data(symbols: list[str], interval: Interval, period: Period, test: bool = False) -> dict[str, Bars]:
     data = yf.download(
         symbols, 
         period=period,
@@ -35,40 +109,52 @@ def fetch_data(symbols: list[str], interval: Interval, period: Period, test: boo
     valid_symbols = [symbol for symbol in symbols if symbol in tickers]
     
     for symbol in valid_symbols:
-        df = data[symbol].copy()
+        # Multi-symbol downloads pad each ticker with NaN rows where it didn't trade
+        df = data[symbol].dropna(subset=['Close'])
+        if df.empty:
+            continue
 
         df.index = set_timezone(pd.to_datetime(df.index), target_tz="Etc/GMT-1")
 
-        df['Current_Price'] = df.loc[:, 'Close'].iloc[-1]
-        df['Current_Volume'] = df.loc[:, 'Volume'].iloc[-1]
-        df['Volatility'] = ((df['High'] - df['Low']) / df['Close'] * 100)
-        df['Change'] = ((df['Close'] - df['Open']) / df['Open'] * 100)
-
-        df = df.astype({
-            'Current_Price': float,
-            'Current_Volume': int,
-            'Volatility': float,
-            'Change': float,
-            'Volume': int
-        })
-
         # df = df.iloc[:-3]
             
-        result[symbol] = df
+        result[symbol] = Bars.from_frame(symbol, df)
     
     return result
 
-def analyze_volume(df: pd.DataFrame, lookback: int, recent: int) -> pd.Series:
-    vol = df['Volume']
+def _mean(a: np.ndarray) -> float:
+    # pandas-style mean: skips NaN, empty -> NaN (without numpy's warnings)
+    a = a[~np.isnan(a)]
+    return a.mean() if a.size else np.nan
+
+def _ewm(a: np.ndarray, span: int) -> np.ndarray:
+    return pd.Series(a, copy=False).ewm(span=span, adjust=False).mean().to_numpy()
+
+def _rolling_mean(a: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    csum = np.concatenate(([0.0], np.cumsum(a, dtype=np.float64)))
+    counts = np.minimum(np.arange(1, len(a) + 1), window)
+    ends = np.arange(1, len(a) + 1)
+    out = (csum[ends] - csum[ends - counts]) / counts
+    out[counts < max(min_periods, 1)] = np.nan
+    return out
+
+def _slope(y: np.ndarray) -> float:
+    # Least-squares slope, same as np.polyfit(x, y, 1)[0]
+    x = np.arange(len(y), dtype=float)
+    x -= x.mean()
+    return (x * (y - y.mean())).sum() / (x * x).sum()
+
+def analyze_volume(bars: Bars, lookback: int, recent: int) -> dict:
+    vol = bars.volume
 
     # EWMA smoothing
-    vol_ewm = vol.ewm(span=recent, adjust=False).mean()
+    vol_ewm = _ewm(vol, recent)
 
-    current_volume = vol.iloc[-1]
+    current_volume = vol[-1]
     avg_all = vol_ewm.mean()
 
-    avg_recent = vol_ewm.tail(recent).mean()
-    avg_back = vol_ewm.iloc[-(lookback+recent):-recent].mean() if len(vol_ewm) >= lookback + recent else avg_all
+    avg_recent = vol_ewm[-recent:].mean()
+    avg_back = vol_ewm[-(lookback+recent):-recent].mean() if len(vol_ewm) >= lookback + recent else avg_all
 
     ratio_global = current_volume / avg_all if avg_all > 0 else 0
     ratio_local = avg_recent / avg_back if avg_back > 0 else 0
@@ -84,35 +170,35 @@ def analyze_volume(df: pd.DataFrame, lookback: int, recent: int) -> pd.Series:
     # “Unusual” volume detection — global context
     is_spike = current_volume > avg_all * 5
 
-    return pd.Series({
+    return {
         'current_volume': int(current_volume),
         'avg_volume_all': int(avg_all),
         'avg_volume_back': int(avg_back),
         'avg_volume_recent': int(avg_recent),
-        'volume_ratio_global': ratio_global,
-        'volume_ratio_local': ratio_local,
+        'volume_ratio_global': float(ratio_global),
+        'volume_ratio_local': float(ratio_local),
         'volume_trend': trend,
-        'is_spike': is_spike
-    })
+        'is_spike': bool(is_spike)
+    }
 
-def analyze_price(df: pd.DataFrame, lookback: int, recent: int) -> pd.Series:
-    current_price = df['Close'].iloc[-1]
+def analyze_price(bars: Bars, lookback: int, recent: int) -> dict:
+    close = bars.close
+    current_price = bars.current_price
 
     # Short-term support/resistance
-    local_support = df['Low'].tail(lookback).min()
-    local_resistance = df['High'].tail(lookback).max()
+    local_support = bars.low[-lookback:].min()
+    local_resistance = bars.high[-lookback:].max()
 
     # Long-term trend detection via rolling mean
-    short_mean = pd.Series(df['Close'].rolling(window=recent, min_periods=recent//2).mean())
-    long_mean = pd.Series(df['Close'].rolling(window=lookback, min_periods=lookback//2).mean())
+    short_mean = _rolling_mean(close, recent, recent//2)
+    long_mean = _rolling_mean(close, lookback, lookback//2)
 
-    recent_mean = short_mean.tail(recent).mean()
-    prior_mean = long_mean.iloc[-(lookback+recent):-recent].mean()
+    recent_mean = _mean(short_mean[-recent:])
+    prior_mean = _mean(long_mean[-(lookback+recent):-recent])
     momentum_ratio = (recent_mean / prior_mean - 1) if prior_mean != 0 else 0
 
-    y = df['Close'][-recent:]
-    x = np.arange(len(y), dtype=float)
-    gradient = np.polyfit(x, y, 1)[0] / np.mean(y)
+    y = close[-recent:]
+    gradient = _slope(y) / y.mean()
 
     trend = (
         'bullish' if momentum_ratio > 0.05 or gradient > 0.001 else
@@ -123,43 +209,52 @@ def analyze_price(df: pd.DataFrame, lookback: int, recent: int) -> pd.Series:
     distance_from_support = ((current_price - local_support) / local_support) * 100
     distance_from_resistance = ((local_resistance - current_price) / local_resistance) * 100
 
-    return pd.Series({
+    return {
         'current_price': current_price,
         'trend': trend,
-        'momentum_ratio': momentum_ratio,
-        'price_gradient': gradient,
-        'local_support': local_support,
-        'local_resistance': local_resistance,
-        'distance_from_local_support_pct': distance_from_support,
-        'distance_from_local_resistance_pct': distance_from_resistance,
-        'is_near_local_support': distance_from_support < 5,
-        'is_near_local_resistance': distance_from_resistance < 5
-    })
+        'momentum_ratio': float(momentum_ratio),
+        'price_gradient': float(gradient),
+        'local_support': float(local_support),
+        'local_resistance': float(local_resistance),
+        'distance_from_local_support_pct': float(distance_from_support),
+        'distance_from_local_resistance_pct': float(distance_from_resistance),
+        'is_near_local_support': bool(distance_from_support < 5),
+        'is_near_local_resistance': bool(distance_from_resistance < 5)
+    }
 
-def analyze_volatility(df: pd.DataFrame, lookback: int, recent: int) -> pd.Series:
-    vol = df['Volatility']
-    current_volatility = vol.iloc[-1]
+def analyze_volatility(bars: Bars, lookback: int, recent: int) -> dict:
+    vol = bars.volatility
+    current_volatility = vol[-1]
 
-    ema_vol = vol.ewm(span=lookback, adjust=False).mean()
-    recent_avg = ema_vol.tail(recent).mean()
-    prior_avg = ema_vol.iloc[-(lookback+recent):-recent].mean() if len(vol) >= lookback+recent else ema_vol.mean()
+    ema_vol = _ewm(vol, lookback)
+    recent_avg = _mean(ema_vol[-recent:])
+    prior_avg = _mean(ema_vol[-(lookback+recent):-recent]) if len(vol) >= lookback+recent else _mean(ema_vol)
 
-    ratio_global = current_volatility / vol.mean() if vol.mean() > 0 else 0
+    vol_mean = _mean(vol)
+    ratio_global = current_volatility / vol_mean if vol_mean > 0 else 0
     ratio_local = recent_avg / prior_avg if prior_avg > 0 else 0
 
     trend = 'increasing' if recent_avg > prior_avg * 1.1 else 'decreasing' if recent_avg < prior_avg * 0.9 else 'stable'
 
-    return pd.Series({
-        'current_volatility': current_volatility,
-        'volatility_ratio_global': ratio_global,
-        'volatility_ratio_local': ratio_local,
+    return {
+        'current_volatility': float(current_volatility),
+        'volatility_ratio_global': float(ratio_global),
+        'volatility_ratio_local': float(ratio_local),
         'volatility_trend': trend
-    })
+    }
 
-def opportunity_score(df: pd.DataFrame, lookback: int = 20, recent: int = 5, local: bool = False) -> dict:
-    volume_analysis = analyze_volume(df, lookback, recent)
-    price_analysis = analyze_price(df, lookback, recent)
-    volatility_analysis = analyze_volatility(df, lookback, recent)
+def rate(score: float) -> str:
+    return (
+        'strong_buy' if score >= 70 else
+        'buy' if score >= 50 else
+        'watch' if score >= 30 else
+        'pass'
+    )
+
+def opportunity_score(bars: Bars, lookback: int = 20, recent: int = 5, local: bool = False) -> dict:
+    volume_analysis = analyze_volume(bars, lookback, recent)
+    price_analysis = analyze_price(bars, lookback, recent)
+    volatility_analysis = analyze_volatility(bars, lookback, recent)
 
     score = 0
     signals: list[str] = []
@@ -218,55 +313,288 @@ def opportunity_score(df: pd.DataFrame, lookback: int = 20, recent: int = 5, loc
     # Clamp & rate
     score = max(0, min(score, 100))
 
-    rating = (
-        'strong_buy' if score >= 70 else
-        'buy' if score >= 50 else
-        'watch' if score >= 30 else
-        'pass'
-    )
-
     return {
         'score': score,
         'signals': signals,
-        'rating': rating
+        'rating': rate(score)
     }
 
 
-def multi_timeframe_opportunity(symbol: str) -> dict:
-    short_df = fetch_data([symbol], '1h', '5d', test=True)[symbol]
-    short_score = opportunity_score(short_df, lookback=15, recent=2, local=True)
-
-    medium_df = fetch_data([symbol], '1d', '1mo')[symbol]
-    medium_score = opportunity_score(medium_df, lookback=15, recent=3, local=False)
-
-    long_df = fetch_data([symbol], '1wk', '3mo')[symbol]
-    long_score = opportunity_score(long_df, lookback=12, recent=2, local=False)
-
-    with pd.option_context('display.max_rows', None):
-        plot(short_df['Volume'])
-        print(medium_df[['Close', 'Open', 'High', 'Low', 'Volatility', 'Volume', 'Change']])
-
-    # Combine with weighting
-    combined_score = short_score['score'] * 0.5 + long_score['score'] * 0.2 + medium_score['score'] * 0.3
+# Bit positions for opportunity_scores' `flags` column, in the order
+# opportunity_score appends them to its `signals` list
+SIGNALS = (
+    'extreme_volume_local',
+    'volatility_spike_local',
+    'sustained_volume_global',
+    'volume_spike_global',
+    'high_volatility_global',
+    'strong_upward_gradient',
+    'downward_gradient',
+    'bounce_off_support',
+    'bullish_trend',
+    'bearish_trend',
+    'volatility_rising',
+    'high_conviction_local',
+)
+FLAG = {name: 1 << i for i, name in enumerate(SIGNALS)}
+
+def decode_signals(flags: int) -> list[str]:
+    return [name for name in SIGNALS if flags & FLAG[name]]
+
+def _panel(bars: list[Bars], column: str, width: int) -> np.ndarray:
+    # Right-aligned [symbols, bars] matrix so the latest bar is always the last column
+    out = np.full((len(bars), width), np.nan)
+    for row, b in zip(out, bars):
+        values = getattr(b, column)
+        row[width - len(values):] = values
+    return out
+
+def _nanmean(a: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(a)
+    count = valid.sum(axis=1)
+    total = np.where(valid, a, 0).sum(axis=1)
+    return np.divide(total, count, out=np.full(len(a), np.nan), where=count > 0)
+
+def _ewm_rows(a: np.ndarray, span: int) -> np.ndarray:
+    # Row-wise ewm(span, adjust=False).mean(), starting at each row's first valid value
+    alpha = 2 / (span + 1)
+    out = np.empty_like(a)
+    prev = a[:, 0].copy()
+    out[:, 0] = prev
+    for t in range(1, a.shape[1]):
+        x = a[:, t]
+        prev = np.where(np.isnan(prev), x, np.where(np.isnan(x), prev, prev + alpha * (x - prev)))
+        out[:, t] = prev
+    return out
+
+def _rolling_mean_rows(a: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    # Row-wise rolling(window, min_periods).mean() from cumulative sums and counts
+    valid = ~np.isnan(a)
+    csum = np.zeros((a.shape[0], a.shape[1] + 1))
+    np.cumsum(np.where(valid, a, 0), axis=1, out=csum[:, 1:])
+    ccount = np.zeros(csum.shape, dtype=np.int64)
+    np.cumsum(valid, axis=1, out=ccount[:, 1:])
+
+    ends = np.arange(1, a.shape[1] + 1)
+    starts = np.maximum(ends - window, 0)
+    count = ccount[:, ends] - ccount[:, starts]
+    total = csum[:, ends] - csum[:, starts]
+    return np.where(count >= max(min_periods, 1), total / np.maximum(count, 1), np.nan)
+
+def _slope_rows(y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Row-wise least-squares slope over the non-NaN points, and their mean
+    valid = ~np.isnan(y)
+    count = valid.sum(axis=1)
+    x = np.broadcast_to(np.arange(y.shape[1], dtype=float), y.shape)
+    x_mean = np.where(valid, x, 0).sum(axis=1) / count
+    y_mean = np.where(valid, y, 0).sum(axis=1) / count
+    dx = np.where(valid, x - x_mean[:, None], 0)
+    dy = np.where(valid, y - y_mean[:, None], 0)
+    return (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1), y_mean
+
+def opportunity_scores(bars: list[Bars] | dict[str, Bars], lookback: int = 20, recent: int = 5, local: bool = False) -> pd.DataFrame:
+    """
+    Cross-sectional opportunity_score: scores every symbol at once with
+    array operations over a right-aligned [symbols, bars] panel.
+
+    Returns one row per symbol ranked by score, with the signal set packed
+    into the `flags` bit-mask (see SIGNALS / decode_signals).
+    """
+    bars = list(bars.values()) if isinstance(bars, dict) else list(bars)
+    if not bars:
+        return pd.DataFrame(columns=['score', 'rating', 'flags'])
+
+    lengths = np.array([len(b) for b in bars])
+    width = lengths.max()
+    has_back = lengths >= lookback + recent
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # --- Volume ---
+        vol = _panel(bars, 'volume', width)
+        vol_ewm = _ewm_rows(vol, recent)
+        current_volume = vol[:, -1]
+        avg_all = _nanmean(vol_ewm)
+        avg_recent = _nanmean(vol_ewm[:, -recent:])
+        avg_back = np.where(has_back, _nanmean(vol_ewm[:, -(lookback+recent):-recent]), avg_all)
+        volume_ratio_global = np.where(avg_all > 0, current_volume / avg_all, 0)
+        volume_ratio_local = np.where(avg_back > 0, avg_recent / avg_back, 0)
+        is_spike = current_volume > avg_all * 5
+
+        # --- Price ---
+        close = _panel(bars, 'close', width)
+        current_price = close[:, -1]
+        local_support = np.nanmin(_panel(bars, 'low', width)[:, -lookback:], axis=1)
+        local_resistance = np.nanmax(_panel(bars, 'high', width)[:, -lookback:], axis=1)
+
+        # Rolling means only need the tail that feeds the recent/prior windows
+        tail = close[:, -2 * (lookback + recent):]
+        recent_mean = _nanmean(_rolling_mean_rows(tail, recent, recent//2)[:, -recent:])
+        prior_mean = _nanmean(_rolling_mean_rows(tail, lookback, lookback//2)[:, -(lookback+recent):-recent])
+        momentum_ratio = np.where(prior_mean != 0, recent_mean / prior_mean - 1, 0)
+
+        slope, y_mean = _slope_rows(close[:, -recent:])
+        gradient = slope / y_mean
+
+        bullish = (momentum_ratio > 0.05) | (gradient > 0.001)
+        bearish = ~bullish & ((momentum_ratio < -0.05) | (gradient < -0.001))
+
+        distance_from_support = (current_price - local_support) / local_support * 100
+        distance_from_resistance = (local_resistance - current_price) / local_resistance * 100
+        near_support = distance_from_support < 5
+
+        # --- Volatility ---
+        vola = _panel(bars, 'volatility', width)
+        current_volatility = vola[:, -1]
+        ema_vola = _ewm_rows(vola, lookback)
+        recent_avg = _nanmean(ema_vola[:, -recent:])
+        prior_avg = np.where(has_back, _nanmean(ema_vola[:, -(lookback+recent):-recent]), _nanmean(ema_vola))
+        vola_mean = _nanmean(vola)
+        volatility_ratio_global = np.where(vola_mean > 0, current_volatility / vola_mean, 0)
+        volatility_ratio_local = np.where(prior_avg > 0, recent_avg / prior_avg, 0)
+        volatility_rising = recent_avg > prior_avg * 1.1
+
+    # --- Signals (same rules as opportunity_score) ---
+    n = len(bars)
+    hit = dict.fromkeys(SIGNALS, np.zeros(n, dtype=bool))
+    if local:
+        hit['extreme_volume_local'] = volume_ratio_local > 2
+        hit['volatility_spike_local'] = volatility_ratio_local > 1.5
+    else:
+        hit['sustained_volume_global'] = volume_ratio_global > 1.5
+        hit['volume_spike_global'] = ~hit['sustained_volume_global'] & is_spike
+        hit['high_volatility_global'] = volatility_ratio_global > 2
+
+    hit['strong_upward_gradient'] = gradient > 0.002
+    hit['downward_gradient'] = gradient < -0.002
+    hit['bounce_off_support'] = near_support & (momentum_ratio > 0)
+    hit['bullish_trend'] = bullish
+    hit['bearish_trend'] = bearish
+    hit['volatility_rising'] = volatility_rising
+    if local:
+        hit['high_conviction_local'] = hit['extreme_volume_local'] & hit['bounce_off_support']
+
+    weights = {
+        'extreme_volume_local': 30,
+        'volatility_spike_local': 10,
+        'sustained_volume_global': 20,
+        'high_volatility_global': 10,
+        'strong_upward_gradient': 10,
+        'downward_gradient': -10,
+        'bounce_off_support': 20,
+        'bullish_trend': 10,
+        'bearish_trend': -10,
+        'volatility_rising': 10,
+        'high_conviction_local': 10,
+    }
 
-    rating = (
-        'strong_buy' if combined_score >= 70 else
-        'buy' if combined_score >= 50 else
-        'watch' if combined_score >= 30 else
-        'pass'
+    score = np.zeros(n, dtype=np.int64)
+    flags = np.zeros(n, dtype=np.int64)
+    for name, mask in hit.items():
+        score += mask * weights.get(name, 0)
+        flags |= mask * FLAG[name]
+    score = np.clip(score, 0, 100)
+
+    rating = np.select(
+        [score >= 70, score >= 50, score >= 30],
+        ['strong_buy', 'buy', 'watch'],
+        'pass',
     )
 
-    return {
-        'symbol': symbol,
-        'combined_score': round(combined_score, 1),
+    result = pd.DataFrame({
+        'score': score,
         'rating': rating,
-        'short_term': short_score,
-        'medium_term': medium_score,
-        'long_term': long_score,
-    }
+        'flags': flags,
+        'current_price': current_price,
+        'current_volume': current_volume.astype(np.int64),
+        'volume_ratio_global': volume_ratio_global,
+        'volume_ratio_local': volume_ratio_local,
+        'momentum_ratio': momentum_ratio,
+        'price_gradient': gradient,
+        'distance_from_local_support_pct': distance_from_support,
+        'distance_from_local_resistance_pct': distance_from_resistance,
+        'volatility_ratio_global': volatility_ratio_global,
+        'volatility_ratio_local': volatility_ratio_local,
+    }, index=pd.Index([b.symbol for b in bars], name='symbol'))
+
+    return result.sort_values('score', ascending=False, kind='stable')
+
+
+# name -> fetch and scoring parameters, plus weight in the combined score
+TIMEFRAMES = {
+    'short_term': dict(interval='1h', period='5d', lookback=15, recent=2, local=True, weight=0.5),
+    'medium_term': dict(interval='1d', period='1mo', lookback=15, recent=3, local=False, weight=0.3),
+    'long_term': dict(interval='1wk', period='3mo', lookback=12, recent=2, local=False, weight=0.2),
+}
+
+def _score_timeframe(symbols: list[str], interval: Interval, period: Period, lookback: int, recent: int, local: bool) -> tuple[dict[str, Bars], pd.DataFrame]:
+    bars = fetch_data(symbols, interval, period)
+    return bars, opportunity_scores(bars, lookback=lookback, recent=recent, local=local)
+
+def multi_timeframe_opportunity(symbols: list[str], plot_volume: bool = False) -> dict[str, dict]:
+    """
+    Score symbols on short/medium/long timeframes and combine them.
+
+    The three timeframes are fetched and scored concurrently, each as one
+    batched download + vectorized opportunity_scores call. Nothing is
+    plotted or printed unless plot_volume is set.
+    """
+    symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+
+    with ThreadPoolExecutor(max_workers=len(TIMEFRAMES)) as pool:
+        futures = {
+            name: pool.submit(
+                _score_timeframe, symbols,
+                tf['interval'], tf['period'], tf['lookback'], tf['recent'], tf['local'],
+            )
+            for name, tf in TIMEFRAMES.items()
+        }
+        frames = {name: future.result() for name, future in futures.items()}
+
+    results = {}
+    for symbol in symbols:
+        timeframes = {}
+        combined_score = 0.0
+
+        for name, (_, scores) in frames.items():
+            if symbol not in scores.index:
+                # No data on this timeframe, contributes nothing to the combined score
+                timeframes[name] = None
+                continue
+
+            row = scores.loc[symbol]
+            timeframes[name] = {
+                'score': int(row['score']),
+                'signals': decode_signals(int(row['flags'])),
+                'rating': row['rating'],
+            }
+            combined_score += row['score'] * TIMEFRAMES[name]['weight']
+
+        if all(tf is None for tf in timeframes.values()):
+            continue
+
+        results[symbol] = {
+            'symbol': symbol,
+            'combined_score': round(combined_score, 1),
+            'rating': rate(combined_score),
+            **timeframes,
+        }
+
+    if plot_volume:
+        short_bars, medium_bars = frames['short_term'][0], frames['medium_term'][0]
+        with pd.option_context('display.max_rows', None):
+            for symbol in results:
+                if symbol in short_bars:
+                    plot(short_bars[symbol].to_frame()['Volume'])
+                if symbol in medium_bars:
+                    print(medium_bars[symbol].to_frame()[['Close', 'Open', 'High', 'Low', 'Volatility', 'Volume', 'Change']])
+
+    return results
 
 
 def plot(series):
+    # Imported lazily so headless (API) callers never load a GUI backend
+    import matplotlib.pyplot as plt
+
     series.plot(kind='bar', figsize=(10,4), logy=True)
     plt.xticks(rotation=45)
     plt.title("Volume over Time (Log Scale)")
@@ -275,4 +603,4 @@ def plot(series):
     plt.show()
 
 if __name__ == "__main__":
-    print(json.dumps(multi_timeframe_opportunity('BYND'), indent=4))
+    print(json.dumps(multi_timeframe_opportunity(['BYND'], plot_volume=True), indent=4))
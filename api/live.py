@@ -0,0 +1,192 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Hashable, Optional
+import numpy as np
+import pandas as pd
+
+from penstan.api.endpoints.volume.router import get_bars
+from penstan.cache import next_bar_close
+from penstan.compute import run_blocking
+from penstan.fetch import Bars
+from penstan.settings import get_settings
+from pstan.scan import default_processors
+from pstan.signalstore import events_from_frame, get_signal_store
+from pstan.utils.pipe import pipe
+
+# Latest values pushed with every update
+INDICATORS = ('RSI', 'MACD', 'Volume_ratio', 'Volume_pct_rank', 'ATR_pct', 'Boll_pct', 'Session_vwap', 'HOD', 'Buy_sell_ratio')
+
+def _value(v: Any) -> Any:
+    v = v.item() if isinstance(v, np.generic) else v
+    return None if isinstance(v, float) and math.isnan(v) else v
+
+def compute_update(bars: Bars, window: int) -> tuple[dict, dict, pd.DataFrame]:
+    """Latest bar, latest indicator values and every signal event of the series"""
+    df, _ = pipe(bars.to_frame()[['Open', 'High', 'Low', 'Close', 'Volume']], **default_processors(window))
+    last = df.iloc[-1]
+    bar = {'time': bars.index[-1], **{c.lower(): _value(last[c]) for c in ('Open', 'High', 'Low', 'Close', 'Volume')}}
+    indicators = {c: _value(last[c]) for c in INDICATORS if c in df}
+    return bar, indicators, events_from_frame(df)
+
+
+class ClientQueue:
+    """
+    Bounded, never-blocking outbox of one client.
+
+    Snapshots (bars, indicator values) are keyed and merged: a newer one
+    replaces the unsent older one. Events (signals) are kept in order up to
+    `maxsize`, after which the oldest is dropped and counted. put() is O(1)
+    and never awaits, so fan-out can't be held up by a slow consumer.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._events: deque[dict] = deque()
+        self._latest: dict[Hashable, dict] = {}
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._events) + len(self._latest)
+
+    def put(self, message: dict, key: Optional[Hashable] = None) -> None:
+        if key is not None:
+            self._latest.pop(key, None)  # Re-insert so dict order follows recency
+            self._latest[key] = message
+        else:
+            if len(self._events) >= self.maxsize:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(message)
+        self._ready.set()
+
+    async def get(self) -> list[dict]:
+        """Wait for and take everything pending, events first"""
+        await self._ready.wait()
+        self._ready.clear()
+        batch = [*self._events, *self._latest.values()]
+        self._events.clear()
+        self._latest.clear()
+        return batch
+
+
+class Hub:
+    """
+    One feed task per subscribed symbol, shared by all its subscribers.
+
+    A feed wakes when a bar closes, reads bars through the shared cache,
+    computes indicators once in the compute pool and fans the messages out
+    to every subscriber's ClientQueue. Closed-bar signal events also go to
+    the signal store. A feed stops when its last subscriber leaves.
+    """
+
+    def __init__(self, interval: Optional[str] = None, period: Optional[str] = None, window: Optional[int] = None, poll: Optional[float] = None):
+        settings = get_settings()
+        self.interval = interval or settings.LIVE_INTERVAL
+        self.period = period or settings.LIVE_PERIOD
+        self.window = window or settings.LIVE_WINDOW
+        self.poll = poll  # Fixed wake-up period instead of bar closes (tests, slow bars)
+        self._clients: dict[str, set[ClientQueue]] = {}
+        self._feeds: dict[str, asyncio.Task] = {}
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._feeds)
+
+    def subscribe(self, client: ClientQueue, symbols: list[str]) -> None:
+        for symbol in symbols:
+            self._clients.setdefault(symbol, set()).add(client)
+            if symbol not in self._feeds:
+                self._feeds[symbol] = asyncio.create_task(self._feed(symbol), name=f'feed:{symbol}')
+
+    def unsubscribe(self, client: ClientQueue, symbols: Optional[list[str]] = None) -> None:
+        for symbol in list(self._clients) if symbols is None else symbols:
+            clients = self._clients.get(symbol)
+            if clients is None:
+                continue
+            clients.discard(client)
+            if not clients:
+                del self._clients[symbol]
+                feed = self._feeds.pop(symbol, None)
+                if feed is not None:
+                    feed.cancel()
+
+    def publish(self, symbol: str, message: dict, key: Optional[Hashable] = None) -> None:
+        for client in self._clients.get(symbol, ()):
+            client.put(message, key)
+
+    async def _sleep(self) -> None:
+        if self.poll is not None:
+            await asyncio.sleep(self.poll)
+        else:
+            wake = next_bar_close(self.interval) + get_settings().CACHE_GRACE_SECONDS
+            await asyncio.sleep(max(0.0, wake - time.time()))
+
+    async def _feed(self, symbol: str) -> None:
+        watermark = None
+        store = get_signal_store()
+        while True:
+            try:
+                bars = await get_bars(symbol, self.interval, self.period)
+                bar, indicators, events = await run_blocking(compute_update, bars, self.window)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.publish(symbol, {'type': 'error', 'symbol': symbol, 'error': getattr(e, 'detail', repr(e))}, key=(symbol, 'error'))
+                await self._sleep()
+                continue
+
+            time_ = bar['time']
+            bar['time'] = time_.isoformat()
+            self.publish(symbol, {'type': 'bar', 'symbol': symbol, 'bar': bar}, key=(symbol, 'bar'))
+            self.publish(symbol, {'type': 'indicators', 'symbol': symbol, 'time': bar['time'], 'values': indicators}, key=(symbol, 'indicators'))
+
+            # The last bar may still be forming; its signals can change until it closes
+            closed = events[events['time'] < time_.value] if len(events) else events
+            if watermark is None:
+                # Subscribing replays nothing, only signals from now on
+                watermark = int(closed['time'].max()) if len(closed) else 0
+            new = closed[closed['time'] > watermark] if len(closed) else closed
+            if len(new):
+                store.add_events(symbol, new)
+                watermark = int(new['time'].max())
+                for event in new.to_dict(orient='records'):
+                    t = pd.Timestamp(event.pop('time'), tz='UTC').isoformat()
+                    self.publish(symbol, {'type': 'signal', 'symbol': symbol, 'time': t, **{k: _value(v) for k, v in event.items()}})
+
+            await self._sleep()
+
+    async def close(self) -> None:
+        feeds = list(self._feeds.values())
+        for feed in feeds:
+            feed.cancel()
+        await asyncio.gather(*feeds, return_exceptions=True)
+        self._feeds.clear()
+        self._clients.clear()
+
+
+_hub: Optional[Hub] = None
+
+def queue_stats() -> dict:
+    """Client outboxes of the running hub: count, pending messages, drops"""
+    clients = {c for cs in _hub._clients.values() for c in cs} if _hub is not None else set()
+    return {
+        'clients': len(clients),
+        'pending': sum(len(c) for c in clients),
+        'max_pending': max((len(c) for c in clients), default=0),
+        'dropped': sum(c.dropped for c in clients),
+    }
+
+def get_hub() -> Hub:
+    global _hub
+    if _hub is None:
+        _hub = Hub()
+    return _hub
+
+async def shutdown() -> None:
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+    _hub = None
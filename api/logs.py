@@ -1,24 +1,190 @@
-from datetime import datetime
+import atexit
+import copy
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pythonjsonlogger import json
 
 from penstan.settings import get_settings
 
 class JsonFormatter(json.JsonFormatter):
 
-    def add_fields(self, log_data, record, message_dict): 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._second = None
+        self._prefix = ''
+
+    def iso_time(self, created: float) -> str:
+        # strftime once per second, only the microseconds change in between
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        return f'{self._prefix}.{int((created - second) * 1e6):06d}Z'
+
+    def add_fields(self, log_data, record, message_dict):
         super().add_fields(log_data, record, message_dict)
         if not log_data.get('timestamp'):
-            # this doesn't use record.created, so it is slightly off
-            now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-            log_data['timestamp'] = now
+            log_data['timestamp'] = self.iso_time(record.created)
         if log_data.get('level'):
             log_data['level'] = log_data['level'].upper()
         else:
             log_data['level'] = record.levelname
 
+
+class AccessSampler(logging.Filter):
+    """
+    Keeps `rate` of successful access log records, evenly spaced rather
+    than random, and every 4xx/5xx. Kept records carry `sample_rate` so
+    counts can be scaled back up.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+        self._credit = 0.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1:
+            return True
+        # uvicorn access args: (client, method, path, http version, status)
+        args = record.args if isinstance(record.args, tuple) else ()
+        if len(args) >= 5 and isinstance(args[4], int) and args[4] >= 400:
+            return True
+
+        self._credit += self.rate
+        if self._credit < 1:
+            return False
+        self._credit -= 1
+        record.sample_rate = self.rate
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Never blocks the caller: a full queue drops the record and counts it"""
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, so no pickling: only freeze the message, whose args
+        # could change before the listener gets to it
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    Drains up to `batch_size` records at a time, waiting at most
+    `flush_interval` seconds for a batch to fill, and writes each stream
+    handler's lines with one write and one flush.
+    """
+
+    def __init__(self, q: queue.Queue, *handlers: logging.Handler, batch_size: int = 256, flush_interval: float = 0.5):
+        super().__init__(q, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)  # Blocks until there's room, the thread is draining
+
+    def handle_batch(self, records: list[logging.LogRecord]) -> None:
+        for handler in self.handlers:
+            batch = [r for r in records if r.levelno >= handler.level and handler.filter(r)]
+            if not batch:
+                continue
+            if not isinstance(handler, logging.StreamHandler):
+                for record in batch:
+                    handler.handle(record)
+                continue
+
+            lines = []
+            for record in batch:
+                try:
+                    lines.append(handler.format(record) + handler.terminator)
+                except Exception:
+                    handler.handleError(record)
+            with handler.lock:
+                handler.stream.write(''.join(lines))
+                handler.flush()
+
+    def _monitor(self) -> None:
+        q = self.queue
+        while True:
+            record = q.get()
+            done = record is self._sentinel
+            batch = [] if done else [record]
+
+            deadline = time.monotonic() + self.flush_interval
+            while not done and len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if record is self._sentinel:
+                    done = True
+                else:
+                    batch.append(record)
+
+            if batch:
+                self.handle_batch(batch)
+            if done:
+                break
+
+
+def queue_handler(stream_level: str = 'INFO', maxsize: int = 10000, batch_size: int = 256, flush_interval: float = 0.5) -> QueueHandler:
+    """
+    dictConfig factory: a QueueHandler in front of a JSON stdout handler
+    written by a BatchingQueueListener thread, stopped (and flushed) at exit.
+    dictConfig keeps `level` for the returned handler, hence `stream_level`.
+    """
+    stdout = logging.StreamHandler(sys.stdout)
+    stdout.setFormatter(JsonFormatter())
+    stdout.setLevel(stream_level)
+
+    q = queue.Queue(maxsize)
+    listener = BatchingQueueListener(q, stdout, batch_size=batch_size, flush_interval=flush_interval)
+    listener.start()
+    atexit.register(listener.stop)
+
+    handler = DroppingQueueHandler(q)
+    handler.listener = listener
+    return handler
+
 def get_log_config() -> dict:
     settings = get_settings()
 
+    if settings.LOG_QUEUE:
+        stdout = {
+            "()": "penstan.logs.queue_handler",
+            "level": settings.LOG_LEVEL,
+            "stream_level": settings.LOG_LEVEL,
+            "maxsize": settings.LOG_QUEUE_SIZE,
+            "batch_size": settings.LOG_BATCH_SIZE,
+            "flush_interval": settings.LOG_FLUSH_INTERVAL,
+        }
+    else:
+        stdout = {
+            "formatter": "json",
+            "class": "logging.StreamHandler",
+            "stream": "ext://sys.stdout",
+            "level": settings.LOG_LEVEL,
+        }
+
     return {
         "version": 1,
         "formatters": {
@@ -26,14 +192,15 @@ def get_log_config() -> dict:
                 "class": "penstan.logs.JsonFormatter"
             }
         },
-        "handlers": {
-            "stdout": {
-                "formatter": "json",
-                "class": "logging.StreamHandler",
-                "stream": "ext://sys.stdout",
-                "level": settings.LOG_LEVEL,
+        "filters": {
+            "access_sample": {
+                "()": "penstan.logs.AccessSampler",
+                "rate": settings.LOG_ACCESS_SAMPLE_RATE,
             }
         },
+        "handlers": {
+            "stdout": stdout,
+        },
         "loggers": {
             "uvicorn.error": {
                 "level": settings.LOG_LEVEL,
@@ -41,6 +208,7 @@ def get_log_config() -> dict:
             },
             "uvicorn.access": {
                 "level": settings.LOG_LEVEL,
+                "filters": ["access_sample"],
                 "propagate": True
             },
         },
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Optional
+
+from penstan import charts, compute, live
+from penstan.cache import get_bars_cache, get_results_cache
+from penstan.settings import get_settings
+from pstan.utils import metrics
+
+# Process-level figures, read when /metrics is scraped
+_CACHES = {'bars': get_bars_cache, 'results': get_results_cache}
+
+metrics.REGISTRY.callback_counter(
+    'penstan_cache_hits_total', 'Cache lookups served from memory', ['cache'],
+    lambda: {(name, ): get().hits for name, get in _CACHES.items()},
+)
+metrics.REGISTRY.callback_counter(
+    'penstan_cache_misses_total', 'Cache lookups that computed', ['cache'],
+    lambda: {(name, ): get().misses for name, get in _CACHES.items()},
+)
+metrics.REGISTRY.gauge(
+    'penstan_cache_entries', 'Entries held per cache', ['cache'],
+    fn=lambda: {(name, ): len(get()) for name, get in _CACHES.items()},
+)
+metrics.REGISTRY.gauge(
+    'penstan_queue_depth', 'Calls running or waiting per pool', ['pool'],
+    fn=lambda: {('compute', ): compute.queue_depth(), ('charts', ): charts.queue_depth()},
+)
+metrics.REGISTRY.gauge(
+    'penstan_live_queue', 'Live push client outboxes', ['stat'],
+    fn=lambda: {(k, ): v for k, v in live.queue_stats().items() if k != 'dropped'},
+)
+metrics.REGISTRY.callback_counter(
+    'penstan_live_dropped_total', 'Events dropped from full live outboxes of connected clients', [],
+    lambda: {(): live.queue_stats()['dropped']},
+)
+
+LOOP_LAG = metrics.REGISTRY.histogram(
+    'penstan_event_loop_lag_seconds', 'Oversleep of a periodic event loop probe',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+_probe: Optional[asyncio.Task] = None
+
+async def _watch_loop(interval: float) -> None:
+    # A sleep that wakes late means something held the loop that long
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
+
+def start() -> None:
+    global _probe
+    settings = get_settings()
+    if not settings.METRICS_ENABLED:
+        return
+    metrics.enable()
+    _probe = asyncio.create_task(_watch_loop(settings.METRICS_LOOP_INTERVAL), name='loop-lag')
+
+async def stop() -> None:
+    global _probe
+    if _probe is not None:
+        _probe.cancel()
+        await asyncio.gather(_probe, return_exceptions=True)
+    _probe = None
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+import zlib
+from typing import Optional
+import pandas as pd
+
+from penstan.api.endpoints.volume.router import warm
+from penstan.cache import next_bar_close
+from penstan.settings import get_settings
+from pstan.sessions import POST, PRE, REGULAR, SessionCalendar
+
+logger = logging.getLogger(__name__)
+
+class Scheduler:
+    """
+    Refreshes bars and default responses of a watchlist right after every
+    bar close, so requests find warm cache entries.
+
+    One loop per interval sleeps until the next close (plus the cache's
+    grace period) and skips bars that closed outside the trading session.
+    Symbols then start at stable offsets spread over `spread` seconds
+    rather than all at once. Lag is the time from bar close to a symbol's
+    refresh finishing.
+    """
+
+    def __init__(self, symbols: list[str], intervals: list[str], prepost: bool = False, spread: float = 20.0):
+        self.symbols = symbols
+        self.intervals = intervals
+        self.prepost = prepost
+        self.segments = (PRE, REGULAR, POST) if prepost else (REGULAR,)
+        self.spread = spread
+        self.calendar = SessionCalendar()
+        self._tasks: list[asyncio.Task] = []
+        self.stats = {
+            interval: {'runs': 0, 'skipped': 0, 'refreshed': 0, 'errors': 0, 'last_close': None, 'last_lag': None, 'max_lag': 0.0, 'mean_lag': None}
+            for interval in intervals
+        }
+
+    def in_session(self, when: float) -> bool:
+        label = self.calendar.label(pd.DatetimeIndex([pd.Timestamp(when, unit='s', tz='UTC')]))
+        return int(label['segment'].iloc[0]) in self.segments
+
+    def offset(self, symbol: str, interval: str) -> float:
+        # Stable per symbol, uniform over the spread window
+        return zlib.crc32(f'{symbol}:{interval}'.encode()) / 0xFFFFFFFF * self.spread
+
+    async def _refresh(self, symbol: str, interval: str, close: float) -> None:
+        stats = self.stats[interval]
+        await asyncio.sleep(max(0.0, close + get_settings().CACHE_GRACE_SECONDS + self.offset(symbol, interval) - time.time()))
+        try:
+            await warm(symbol, interval)
+        except Exception as e:
+            stats['errors'] += 1
+            logger.warning('Refresh of %s %s failed: %s', symbol, interval, getattr(e, 'detail', repr(e)))
+            return
+
+        lag = time.time() - close
+        stats['refreshed'] += 1
+        stats['last_lag'] = round(lag, 3)
+        stats['max_lag'] = round(max(stats['max_lag'], lag), 3)
+        stats['mean_lag'] = round(lag if stats['mean_lag'] is None else 0.9 * stats['mean_lag'] + 0.1 * lag, 3)
+
+    async def _run(self, interval: str) -> None:
+        stats = self.stats[interval]
+        close = 0.0
+        while True:
+            # From the last close at the earliest, so a sleep that wakes early can't repeat it
+            close = next_bar_close(interval, max(time.time(), close), self.prepost)
+            await asyncio.sleep(max(0.0, close - time.time()))
+
+            # Classify the bar that just closed by its last second
+            if not self.in_session(close - 1):
+                stats['skipped'] += 1
+                continue
+
+            stats['runs'] += 1
+            stats['last_close'] = pd.Timestamp(close, unit='s', tz='UTC').isoformat()
+            await asyncio.gather(*(self._refresh(s, interval, close) for s in self.symbols))
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._run(i), name=f'scheduler:{i}') for i in self.intervals]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+_scheduler: Optional[Scheduler] = None
+
+def get_scheduler() -> Optional[Scheduler]:
+    return _scheduler
+
+def start() -> None:
+    global _scheduler
+    settings = get_settings()
+    symbols = [s.strip().upper() for s in settings.WATCHLIST.split(',') if s.strip()]
+    if not settings.SCHEDULER_ENABLED or not symbols:
+        return
+    intervals = [i.strip() for i in settings.SCHEDULER_INTERVALS.split(',') if i.strip()]
+    _scheduler = Scheduler(symbols, intervals, settings.SCHEDULER_PREPOST, settings.SCHEDULER_SPREAD_SECONDS)
+    _scheduler.start()
+
+async def stop() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+    _scheduler = None
@@ -18,7 +18,51 @@ class Settings(BaseSettings):
     RELOAD: bool = False
     PORT: int = 8080
     LOG_LEVEL: str = 'INFO'
+    LOG_QUEUE: bool = False  # Write logs from a background thread instead of the caller
+    LOG_QUEUE_SIZE: int = 10000  # Records beyond this are dropped, never waited on
+    LOG_BATCH_SIZE: int = 256
+    LOG_FLUSH_INTERVAL: float = 0.5  # Longest a record waits for its batch to fill
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0  # Share of 2xx/3xx access logs kept
     DEBUG: bool = False
 
+    # Blocking fetch/compute runs in this pool, never on the event loop
+    COMPUTE_MODE: str = 'thread'  # thread | process
+    COMPUTE_WORKERS: int = 4
+    COMPUTE_QUEUE: int = 64  # Calls running or waiting before new ones are rejected
+    COMPUTE_QUEUE_TIMEOUT: float = 5.0
+
+    # Chart rendering gets its own processes, matplotlib isn't thread-safe
+    CHART_WORKERS: int = 2
+    CHART_QUEUE: int = 16
+
+    # POST /api/scan limits
+    SCAN_MAX_SYMBOLS: int = 1000
+    SCAN_CONCURRENCY: int = 16  # Per request cap on symbols in flight
+
+    # Live push (/api/live): bars feeds use, per-client outbox size
+    LIVE_INTERVAL: str = '5m'
+    LIVE_PERIOD: str = '5d'
+    LIVE_WINDOW: int = 16
+    LIVE_CLIENT_QUEUE: int = 256
+    LIVE_HEARTBEAT_SECONDS: float = 15.0
+
+    # Background precompute of the watchlist after every bar close
+    SCHEDULER_ENABLED: bool = False
+    WATCHLIST: str = ''  # Comma separated symbols
+    SCHEDULER_INTERVALS: str = '5m,1h'  # The volume and score endpoint defaults
+    SCHEDULER_PREPOST: bool = False  # Also refresh bars closing in pre/post market
+    SCHEDULER_SPREAD_SECONDS: float = 20.0  # Refreshes are spread over this long after each close
+
+    # Indicator series responses smaller than this are sent uncompressed
+    COMPRESS_MIN_BYTES: int = 1024
+
+    # Prometheus text metrics at /metrics
+    METRICS_ENABLED: bool = False
+    METRICS_LOOP_INTERVAL: float = 0.5  # Event loop lag probe period
+
+    # Bars are cached until the next bar closes, plus a grace period for the provider
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_GRACE_SECONDS: float = 2.0
+
     class Config:
         env_file = ".env"
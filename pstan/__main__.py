@@ -1,17 +1,110 @@
+import argparse
+import csv
+import json
+import sys
+import time
 from datetime import timedelta
-import matplotlib.pyplot as plt
 import pandas as pd
 
-from pstan.data.yfinance import fetch_data_yfinance
-from pstan.processors.base import Base
-from pstan.processors.boll import Boll
-from pstan.processors.macd import MACD
-from pstan.processors.pressure import Pressure
-from pstan.processors.rsi import RSI
-from pstan.processors.volume import Volume
-from pstan.processors.atr import ATR
+from pstan.scan import load_universe, run_scan
+from pstan.signalstore import get_signal_store
+from pstan.utils.profiler import Profiler
 
-if __name__ == '__main__':
-    pass
+COLUMNS = ['symbol', 'strength', 'signals', 'atr_breaks', 'macd_buys', 'volume_ratio', 'rsi', 'close', 'last_signal']
+
+def write_rows(rows: list[dict], fmt: str, out) -> None:
+    if fmt == 'ndjson':
+        for row in rows:
+            out.write(json.dumps(row, default=str) + '\n')
+    elif fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        out.write(df.to_string(index=False) + '\n' if len(df) else 'No symbols with data\n')
+
+def scan(args: argparse.Namespace) -> None:
+    symbols = load_universe(args.universe)
+    memory = not args.profile_no_memory
+    if args.profile and memory and args.mode == 'thread':
+        # tracemalloc is process-wide, overlapping threads can't be told apart
+        print('Memory peaks need --mode serial or process, profiling time only', file=sys.stderr)
+        memory = False
+    profiler = Profiler(memory=memory, columns=args.profile_columns) if args.profile else None
+
+    rows, timings = run_scan(
+        symbols,
+        interval=args.interval,
+        period=timedelta(days=args.days),
+        window=args.window,
+        recent=args.recent,
+        top=args.top,
+        mode=args.mode,
+        workers=args.workers,
+        prepost=args.prepost,
+        use_cache=not args.no_cache,
+        store=get_signal_store() if args.events else None,
+        profiler=profiler,
+    )
+
+    t = time.perf_counter()
+    write_rows(rows, args.format, sys.stdout)
+    if args.events:
+        # Measured against the newest bar seen, so stale data still lists its events
+        store = get_signal_store()
+        newest = store.query()['time'].max() if len(store) else None
+        events = store.recent(timedelta(minutes=args.events), now=newest) if newest is not None else store.query()
+        sys.stdout.write(f'\nSignals in the last {args.events:g} minutes\n')
+        sys.stdout.write(events.to_string(index=False) + '\n' if len(events) else 'None\n')
+    timings['output'] = time.perf_counter() - t
+
+    print(
+        f"{timings['symbols']} symbols ({timings['skipped']} skipped, {timings['errors']} errors) | "
+        f"fetch {timings['fetch']:.2f}s  process {timings['process']:.2f}s  "
+        f"rank {timings['rank'] * 1e3:.1f}ms  output {timings['output'] * 1e3:.1f}ms  "
+        f"wall {timings['wall']:.2f}s",
+        file=sys.stderr,
+    )
 
+    if profiler is not None:
+        profiler.to_chrome_trace(args.profile)
+        print(f'\nProcessors (trace written to {args.profile})', file=sys.stderr)
+        print(profiler.summary().to_string(float_format=lambda v: f'{v:.4f}'), file=sys.stderr)
+        if args.profile_columns:
+            print('\nSlowest columns', file=sys.stderr)
+            print(profiler.summary('column').head(15).to_string(float_format=lambda v: f'{v:.4f}'), file=sys.stderr)
 
+def positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {n}')
+    return n
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='pstan')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('scan', help='Rank a universe of symbols by signal strength')
+    p.add_argument('universe', help='File with symbols separated by whitespace/commas')
+    p.add_argument('-i', '--interval', default='5m')
+    p.add_argument('-d', '--days', type=float, default=5, help='History to fetch')
+    p.add_argument('-w', '--window', type=int, default=16)
+    p.add_argument('-r', '--recent', type=int, default=3, help='Bars counted towards signal strength')
+    p.add_argument('-k', '--top', type=positive_int, default=20)
+    p.add_argument('-f', '--format', choices=['table', 'csv', 'ndjson'], default='table')
+    p.add_argument('-m', '--mode', choices=['serial', 'thread', 'process'], default='thread')
+    p.add_argument('-j', '--workers', type=int, default=8)
+    p.add_argument('--prepost', action='store_true')
+    p.add_argument('--no-cache', action='store_true', help='Always refetch bars')
+    p.add_argument('-e', '--events', type=float, default=0, metavar='MINUTES', help='Also list signals fired across the universe in the last MINUTES')
+    p.add_argument('--profile', metavar='PATH', help='Write a Chrome trace (chrome://tracing, Perfetto, speedscope) of fetch and processor spans')
+    p.add_argument('--profile-columns', action='store_true', help='Also time every column assignment')
+    p.add_argument('--profile-no-memory', action='store_true', help="Skip tracemalloc peaks, it slows processing down")
+    p.set_defaults(func=scan)
+
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    args.func(args)
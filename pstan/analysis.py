@@ -1,17 +1,13 @@
 from pstan.data.yfinance import fetch_data_yfinance, print_meta, Interval 
-from pstan.processors.base import Base
-from pstan.processors.boll import Boll
-from pstan.processors.macd import MACD
-from pstan.processors.pressure import Pressure
-from pstan.processors.rsi import RSI
-from pstan.processors.volume import Volume
-from pstan.processors.atr import ATR
-from pstan.processors.signals import Signals
+from pstan.scan import default_processors
 from pstan.utils.pipe import pipe
 from importlib import reload
 from datetime import datetime, timezone, timedelta
+import io
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 from pstan.utils.plot import dark_theme_plt
 
@@ -20,55 +16,31 @@ from pstan.utils.plot import dark_theme_plt
 
 dark_theme_plt()
 
-def get_metrics(symbol: str):
-    window = 16
-    intervals: list[Interval] = ['5m', '15m', '30m'] #, , '1h'] 
-
-
-    fig, axes = plt.subplots(5, 2, figsize=(16, 25), sharex=True) 
-    axes = axes.flatten()
-
-    for interval in intervals:
-        print(f"\n=== Interval: {interval} ===")
-        df = fetch_data_yfinance(
-            symbol=symbol,
-            period=timedelta(days=14),
-            interval=interval,
-            prepost=False
-        )
-
-        df, p = pipe(
-            pd.DataFrame(df), 
-            base = Base(window=window),
-            vol = Volume(window=window),
-            rsi = RSI(window=window),
-            macd = MACD(),
-            boll = Boll(window=window*2),
-            atr = ATR(window=window*2, break_threshold=1.6),
-            bsp = Pressure(window=window),
-            signals = Signals(window=window)
-        )
-        print(df.index.dtype)
+# (processor, plot method, axes index), drawn in this order
+PANELS = [
+    ('boll', 'plot', 0),
+    ('base', 'plot', 1),
+    ('atr', 'plot', 2),
+    ('vol', 'plot_ratio', 3),
+    ('rsi', 'plot', 4),
+    ('bsp', 'plot', 5),
+    ('macd', 'plot', 6),
+    ('vol', 'plot_momentum', 7),
+    ('vol', 'plot_obv', 8),
+    ('vol', 'plot', 9),
+    ('signals', 'plot', 0),
+]
 
-        p.boll.plot(df, axes[0])
-        p.base.plot(df, axes[1])
-        p.atr.plot(df, axes[2])
-        p.vol.plot_ratio(df, axes[3])
-        p.rsi.plot(df, axes[4])
-        p.bsp.plot(df, axes[5])
-        p.macd.plot(df, axes[6])
-        p.vol.plot_momentum(df, axes[7])
-        p.vol.plot_obv(df, axes[8])
-        p.vol.plot(df, axes[9])
-
-        p.signals.plot(df, axes[0])
-        p.signals.print(df)
+def plot_panels(df: pd.DataFrame, p, axes):
+    for name, method, i in PANELS:
+        getattr(p[name], method)(df, axes[i])
 
+def format_axes(df: pd.DataFrame, axes):
     for ax in axes:
         # X-axis formatting
         xticks = ax.get_xticks()
         if len(xticks) > 25:
-            ax.set_xticks(xticks[::2])
+            ax.set_xticks(xticks[::-(-len(xticks) // 25)])
         
         labels = []
         for i in ax.get_xticks():
@@ -88,6 +60,73 @@ def get_metrics(symbol: str):
         ax.grid(True, alpha=0.2, linestyle='--', linewidth=0.5)
         ax.tick_params(axis='both', labelsize=8)
 
+def get_metrics(symbol: str):
+    window = 16
+    intervals: list[Interval] = ['5m', '15m', '30m'] #, , '1h'] 
+
+
+    fig, axes = plt.subplots(5, 2, figsize=(16, 25), sharex=True) 
+    axes = axes.flatten()
+
+    for interval in intervals:
+        print(f"\n=== Interval: {interval} ===")
+        df = fetch_data_yfinance(
+            symbol=symbol,
+            period=timedelta(days=14),
+            interval=interval,
+            prepost=False
+        )
+
+        df, p = pipe(pd.DataFrame(df), **default_processors(window))
+        print(df.index.dtype)
+
+        plot_panels(df, p, axes)
+        p.signals.print(df)
+
+    format_axes(df, axes)
     plt.tight_layout()
     plt.show()
 
+
+# --- Headless rendering
+
+# Figures reused between renders, keyed by size; building the 5x2 grid
+# costs more than clearing it
+_templates: dict[tuple, tuple[Figure, list]] = {}
+
+def _template(width: float, height: float, dpi: int) -> tuple[Figure, list]:
+    key = (width, height, dpi)
+    if key not in _templates:
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        FigureCanvasAgg(fig)
+        # Not shared: pandas walks every tick of every shared axis after each
+        # plot, which costs more than all the drawing. Limits are aligned below.
+        axes = list(fig.subplots(5, 2).flatten())
+        _templates[key] = (fig, axes)
+    fig, axes = _templates[key]
+    for ax in fig.axes:
+        if ax in axes:
+            ax.clear()
+        else:
+            ax.remove()  # twinx() axes added by the last render
+    return fig, axes
+
+def render_metrics(df: pd.DataFrame, window: int = 16, format: str = 'png', width: float = 16, height: float = 25, dpi: int = 100) -> bytes:
+    """
+    The get_metrics panels of one OHLCV frame as PNG or SVG bytes, drawn on
+    a reused Agg figure. Matplotlib isn't thread-safe: call it from one
+    thread per process.
+    """
+    df, p = pipe(df, **default_processors(window))
+    fig, axes = _template(width, height, dpi)
+    plot_panels(df, p, axes)
+    for ax in axes:
+        ax.set_xlim(-0.5, len(df) - 0.5)
+    format_axes(df, axes)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    # No timestamp in the metadata, so the same data renders the same bytes
+    metadata = {'Date': None} if format == 'svg' else None
+    fig.savefig(buffer, format=format, metadata=metadata)
+    return buffer.getvalue()
@@ -0,0 +1,178 @@
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+TRADE_DTYPE = np.dtype([
+    ('entry_idx', np.int64),
+    ('exit_idx', np.int64),
+    ('entry_time', 'datetime64[ns]'),
+    ('exit_time', 'datetime64[ns]'),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('ret', np.float64),
+    ('win', np.bool_),
+])
+
+@dataclass
+class BacktestResult:
+    equity: np.ndarray
+    trades: np.ndarray
+    stats: dict = field(default_factory=dict)
+    open_trade: Optional[int] = None  # entry index of a trade still open at the end
+
+
+def _first_hit(high: np.ndarray, low: np.ndarray, start: int, target: float, stop: float, chunk: int = 256) -> tuple[int, bool]:
+    """
+    Index of the first bar from `start` whose range reaches target or stop,
+    and whether it was the target. Searched in doubling chunks so a trade
+    costs O(bars held) instead of O(bars left).
+    """
+    n = len(high)
+    i, size = start, chunk
+    while i < n:
+        j = min(n, i + size)
+        hit_stop = low[i:j] <= stop
+        hit = hit_stop | (high[i:j] >= target)
+        if hit.any():
+            k = int(hit.argmax())
+            # Can't tell the order inside one bar, assume the stop came first
+            return i + k, not hit_stop[k]
+        i, size = j, size * 2
+    return -1, False
+
+def backtest_arrays(
+    close: np.ndarray,
+    signal: np.ndarray,
+    high: Optional[np.ndarray] = None,
+    low: Optional[np.ndarray] = None,
+    open: Optional[np.ndarray] = None,
+    stop_loss_pct: float = 0.02,
+    profit_ratio: float = 1.5,
+) -> tuple[np.ndarray, Optional[int]]:
+    """
+    One position at a time: enter at the close of a signal bar, exit at
+    the first later bar that reaches target or stop. Without high/low the
+    checks use the close (Portfolio semantics). With open, gaps through a
+    level fill at the open instead of the level.
+
+    Returns (entry_idx, exit_idx, entry_price, exit_price) rows and the
+    entry index of a trade left open at the end, if any.
+    """
+    high = close if high is None else high
+    low = close if low is None else low
+    take_profit_pct = stop_loss_pct * profit_ratio
+
+    entries = np.flatnonzero(signal)
+    rows = []
+    open_trade = None
+    pos = 0
+
+    while True:
+        k = np.searchsorted(entries, pos)
+        if k == len(entries):
+            break
+
+        i = int(entries[k])
+        entry_price = close[i]
+        target_price = entry_price * (1 + take_profit_pct)
+        stop_price = entry_price * (1 - stop_loss_pct)
+
+        j, is_target = _first_hit(high, low, i + 1, target_price, stop_price)
+        if j < 0:
+            open_trade = i
+            break
+
+        exit_price = target_price if is_target else stop_price
+        if open is not None:
+            exit_price = max(exit_price, open[j]) if is_target else min(exit_price, open[j])
+
+        rows.append((i, j, entry_price, exit_price))
+        pos = j + 1
+
+    return np.array(rows, dtype=np.float64).reshape(-1, 4), open_trade
+
+def make_trades(rows: np.ndarray, times: Optional[np.ndarray] = None) -> np.ndarray:
+    """TRADE_DTYPE records from backtest_arrays rows (times are NaT without `times`)"""
+    entry_idx, exit_idx = rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64)
+
+    trades = np.empty(len(rows), dtype=TRADE_DTYPE)
+    trades['entry_idx'] = entry_idx
+    trades['exit_idx'] = exit_idx
+    trades['entry_time'] = times[entry_idx] if times is not None else np.datetime64('NaT')
+    trades['exit_time'] = times[exit_idx] if times is not None else np.datetime64('NaT')
+    trades['entry_price'] = rows[:, 2]
+    trades['exit_price'] = rows[:, 3]
+    trades['ret'] = rows[:, 3] / rows[:, 2] - 1
+    trades['win'] = rows[:, 3] > rows[:, 2]
+    return trades
+
+def equity_curve(n: int, exit_idx: np.ndarray, growth: np.ndarray, initial_cash: float) -> np.ndarray:
+    # Cash only changes on exit bars (by exit / entry); cumprod seeded with
+    # the initial cash multiplies in the same order as a bar-by-bar loop
+    factors = np.ones(n + 1)
+    factors[0] = initial_cash
+    factors[exit_idx + 1] = growth
+    return np.cumprod(factors)[1:]
+
+def trade_stats(trades: np.ndarray, equity: np.ndarray, initial_cash: float) -> dict:
+    ret = trades['ret']
+    gains, losses = ret[ret > 0].sum(), -ret[ret < 0].sum()
+    peak = np.maximum.accumulate(equity) if len(equity) else equity
+
+    return {
+        'trades': len(trades),
+        'wins': int(trades['win'].sum()),
+        'win_rate': float(trades['win'].mean()) if len(trades) else np.nan,
+        'avg_return': float(ret.mean()) if len(trades) else np.nan,
+        'profit_factor': float(gains / losses) if losses > 0 else np.inf if gains > 0 else np.nan,
+        'avg_bars_held': float((trades['exit_idx'] - trades['entry_idx']).mean()) if len(trades) else np.nan,
+        'total_return': float(equity[-1] / initial_cash - 1) if len(equity) else 0.0,
+        'max_drawdown': float((equity / peak - 1).min()) if len(equity) else 0.0,
+        'final_equity': float(equity[-1]) if len(equity) else initial_cash,
+    }
+
+def _times(df: pd.DataFrame) -> np.ndarray:
+    # Base turns the index into strings, Portfolio expects a 'date' column
+    times = df['date'] if 'date' in df.columns else df.index
+    return pd.DatetimeIndex(pd.to_datetime(times, utc=True)).tz_localize(None).to_numpy('datetime64[ns]')
+
+def backtest(
+    df: pd.DataFrame,
+    stop_loss_pct: float = 0.02,
+    profit_ratio: float = 1.5,
+    initial_cash: float = 1000,
+    signal: str = 'Buy_Signal',
+    compat: bool = False,
+) -> BacktestResult:
+    """
+    Backtest a long-only signal column without printing.
+
+    By default stops and targets are checked against each bar's High/Low
+    with gap fills at the Open. compat=True checks the Close only, exactly
+    like the original Portfolio.run loop.
+    """
+    close = df['Close'].to_numpy(dtype=np.float64)
+    buy = df[signal].to_numpy() == 1
+
+    if compat:
+        rows, open_trade = backtest_arrays(close, buy, stop_loss_pct=stop_loss_pct, profit_ratio=profit_ratio)
+    else:
+        rows, open_trade = backtest_arrays(
+            close, buy,
+            high=df['High'].to_numpy(dtype=np.float64),
+            low=df['Low'].to_numpy(dtype=np.float64),
+            open=df['Open'].to_numpy(dtype=np.float64),
+            stop_loss_pct=stop_loss_pct,
+            profit_ratio=profit_ratio,
+        )
+
+    trades = make_trades(rows, _times(df))
+    equity = equity_curve(len(df), trades['exit_idx'], rows[:, 3] / rows[:, 2], initial_cash)
+
+    return BacktestResult(
+        equity=equity,
+        trades=trades,
+        stats=trade_stats(trades, equity, initial_cash),
+        open_trade=open_trade,
+    )
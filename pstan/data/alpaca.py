@@ -2,7 +2,9 @@ from datetime import datetime, timedelta
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
+from pstan.utils.metrics import timed_fetch
 
+@timed_fetch('alpaca')
 def fetch_data_alpaca(
     symbol: str,
     start,
@@ -0,0 +1,21 @@
+import os
+import pickle
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR = Path(os.environ.get('PSTAN_CACHE_DIR', Path.home() / '.cache' / 'pstan'))
+
+def read_pickle(path: Path) -> Any:
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+
+def write_pickle(path: Path, obj: Any) -> None:
+    # Write to a temp file and rename so readers never see a partial file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
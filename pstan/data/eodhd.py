@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 from eodhd import APIClient
+from pstan.utils.metrics import timed_fetch
 
+@timed_fetch('eodhd')
 def fetch_data_alpaca(
     symbol: str,
     start: datetime,
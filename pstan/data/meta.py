@@ -0,0 +1,125 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Iterable, Optional
+import yfinance as yf
+
+from pstan.data.cache import CACHE_DIR, read_pickle, write_pickle
+
+FIELDS = ('info', 'calendar', 'analyst_price_targets')
+
+# Seconds before each yf.Ticker attribute is refetched
+DEFAULT_TTLS = {
+    'info': 24 * 3600,
+    'calendar': 12 * 3600,
+    'analyst_price_targets': 24 * 3600,
+}
+
+@dataclass
+class TickerMeta:
+    symbol: str
+    info: dict = field(default_factory=dict)
+    calendar: dict = field(default_factory=dict)
+    analyst_price_targets: dict = field(default_factory=dict)
+
+    @property
+    def eps(self) -> Optional[float]:
+        return self.info.get('epsTrailingTwelveMonths')
+
+    def pe(self, price: float) -> Optional[float]:
+        return round(price / self.eps, 4) if self.eps else None
+
+    def summary(self, price: Optional[float] = None) -> dict:
+        """Flat fundamentals for enriching screening results"""
+        price = price if price is not None else self.info.get('regularMarketPrice')
+        return {
+            'eps': self.eps,
+            'pe': self.pe(price) if price else None,
+            'forward_pe': self.info.get('forwardPE'),
+            'market_cap': self.info.get('marketCap'),
+            'float_shares': self.info.get('floatShares'),
+            'short_pct_float': self.info.get('shortPercentOfFloat'),
+            'target_mean': self.analyst_price_targets.get('mean'),
+            'earnings_date': (self.calendar.get('Earnings Date') or [None])[0],
+        }
+
+
+class MetaCache:
+    """
+    Two level (memory + disk) cache of yf.Ticker metadata.
+
+    Every field is stored with its own fetch time so that e.g. the calendar
+    can expire before the info dict. Only stale fields hit the network.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = CACHE_DIR / 'meta',
+        ttls: Optional[dict[str, float]] = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._memory: dict[str, dict[str, tuple[float, Any]]] = {}
+        self._lock = Lock()
+
+    def _path(self, symbol: str) -> Path:
+        return self.cache_dir / f'{symbol.upper()}.pkl'
+
+    def _entries(self, symbol: str) -> dict[str, tuple[float, Any]]:
+        with self._lock:
+            entries = self._memory.get(symbol)
+        if entries is None:
+            entries = read_pickle(self._path(symbol)) or {}
+            with self._lock:
+                self._memory[symbol] = entries
+        return entries
+
+    def _stale(self, entries: dict, fields: Iterable[str], now: float) -> list[str]:
+        return [f for f in fields if f not in entries or now - entries[f][0] > self.ttls[f]]
+
+    def get(self, symbol: str, fields: Iterable[str] = FIELDS) -> TickerMeta:
+        fields = tuple(fields)
+        entries = dict(self._entries(symbol))
+        stale = self._stale(entries, fields, time.time())
+
+        if stale:
+            ticker = yf.Ticker(symbol)
+            for f in stale:
+                try:
+                    value = getattr(ticker, f)
+                except Exception:
+                    # Keep serving the old value (if any) until the next attempt
+                    continue
+                entries[f] = (time.time(), dict(value or {}))
+
+            with self._lock:
+                self._memory[symbol] = entries
+            write_pickle(self._path(symbol), entries)
+
+        return TickerMeta(symbol, **{f: entries[f][1] for f in fields if f in entries})
+
+    def prefetch(self, symbols: Iterable[str], fields: Iterable[str] = FIELDS, max_workers: int = 8) -> dict[str, TickerMeta]:
+        fields = tuple(fields)
+        symbols = list(dict.fromkeys(symbols))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            metas = pool.map(lambda s: self.get(s, fields), symbols)
+            return dict(zip(symbols, metas))
+
+    def invalidate(self, symbol: str) -> None:
+        with self._lock:
+            self._memory.pop(symbol, None)
+        self._path(symbol).unlink(missing_ok=True)
+
+
+_meta_cache: Optional[MetaCache] = None
+
+def get_meta_cache() -> MetaCache:
+    global _meta_cache
+    if _meta_cache is None:
+        _meta_cache = MetaCache()
+    return _meta_cache
+
+def get_meta(symbol: str) -> TickerMeta:
+    return get_meta_cache().get(symbol)
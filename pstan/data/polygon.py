@@ -2,7 +2,9 @@ import pandas as pd
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from massive import RESTClient
+from pstan.utils.metrics import timed_fetch
 
+@timed_fetch('polygon')
 def fetch_data_polygon(
     symbol: str, 
     from_date: datetime,
@@ -3,8 +3,19 @@ import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
 import pytz
+import time
+
+from pstan.data.cache import CACHE_DIR, read_pickle, write_pickle
+from pstan.data.meta import get_meta
+from pstan.utils.metrics import timed_fetch
 
 Interval = Literal['1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '4h', '1d', '5d', '1wk', '1mo', '3mo']
+
+INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800,
+    '60m': 3600, '90m': 5400, '1h': 3600, '4h': 14400,
+    '1d': 86400, '5d': 5 * 86400, '1wk': 7 * 86400, '1mo': 30 * 86400, '3mo': 90 * 86400,
+}
     
 def tz_aware(date):
     # Make timezone-aware for comparison
@@ -17,6 +28,7 @@ def tz_aware(date):
             
     return date
         
+@timed_fetch('yfinance')
 def fetch_data_yfinance(
     symbol: str,
     interval: Interval,
@@ -57,13 +69,40 @@ def fetch_data_yfinance(
 
     return data
 
+def fetch_data_yfinance_cached(
+    symbol: str,
+    interval: Interval,
+    period = timedelta(days=7),
+    prepost = False,
+    ttl = None,
+    cache_dir = CACHE_DIR / 'bars',
+):
+    """
+    fetch_data_yfinance backed by an on-disk cache. Entries are reused for
+    `ttl` seconds, which defaults to one bar since nothing new can arrive
+    before the next bar closes.
+    """
+    ttl = INTERVAL_SECONDS[interval] if ttl is None else ttl
+    key = f'{symbol.upper()}_{interval}_{int(period.total_seconds())}_{int(prepost)}'
+    path = cache_dir / f'{key}.pkl'
+
+    cached = read_pickle(path)
+    if cached is not None and time.time() - cached[0] < ttl:
+        return cached[1]
+
+    data = fetch_data_yfinance(symbol=symbol, interval=interval, period=period, prepost=prepost)
+    if not data.empty:
+        write_pickle(path, (time.time(), data))
+
+    return data
+
 def print_meta(symbol: str, df: pd.DataFrame):
     rnd, w = 4, 40
 
-    ticker = yf.Ticker(symbol)
+    meta = get_meta(symbol)
     price = round(df['Close'].iloc[-1].item(), rnd)
-    eps = ticker.info['epsTrailingTwelveMonths']
-    pe = round(price/eps, rnd)
+    eps = meta.eps
+    pe = meta.pe(price)
 
     fill = (w // 2) - (len(symbol) // 2)
 
@@ -74,7 +113,7 @@ def print_meta(symbol: str, df: pd.DataFrame):
         {price=},
         {eps=},
         {pe=},
-        {ticker.calendar=},
-        {ticker.analyst_price_targets=},
+        {meta.calendar=},
+        {meta.analyst_price_targets=},
     ''')
     print('-' * w)
@@ -0,0 +1,129 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Scale-free indicator columns from default_processors, defined on every bar
+FEATURES = (
+    'Close_pct_change', 'Range_pct', 'Gain_close_ratio', 'Price_efficiency',
+    'Close_roc_fast', 'Close_roc_slow', 'Distance_to_resistance', 'Distance_to_support',
+    'Gap_pct', 'Money_flow_ratio', 'Volume_ratio_fast', 'Volume_ratio_slow',
+    'Volume_momentum_norm', 'Volume_pct_rank', 'OBV_change',
+    'RSI', 'RSI_fast', 'RSI_slow', 'Boll_pct', 'ATR_pct',
+)
+
+# Normalized over the whole frame, so every bar sees future min/max
+LOOKAHEAD = ('Volume_n', 'Close_n')
+
+Label = Callable[[pd.DataFrame, int], np.ndarray]
+
+def forward_return(df: pd.DataFrame, horizon: int) -> np.ndarray:
+    """Close[t + horizon] / Close[t] - 1, NaN where the future bar doesn't exist"""
+    close = df['Close'].to_numpy(dtype=np.float64)
+    label = np.full(len(close), np.nan)
+    label[:len(close) - horizon] = close[horizon:] / close[:len(close) - horizon] - 1
+    return label
+
+@dataclass
+class Dataset:
+    path: Path
+    samples: int
+    window: int
+    features: list[str]
+    symbols: list[str]
+
+    def load(self, mmap: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """X [samples, window, features], y, symbol id and end time (ns) per sample"""
+        mode = 'r' if mmap else None
+        return tuple(np.load(self.path / f'{name}.npy', mmap_mode=mode) for name in ('X', 'y', 'symbol', 'time'))
+
+
+def _valid_ends(x: np.ndarray, y: np.ndarray, window: int, stride: int) -> np.ndarray:
+    """Window end positions with no NaN feature inside the window and a defined label"""
+    bad = np.isnan(x).any(axis=1).astype(np.int64)
+    bad_in_window = np.convolve(bad, np.ones(window, dtype=np.int64), mode='valid')
+    ends = np.arange(window - 1, len(x))
+    keep = (bad_in_window == 0) & ~np.isnan(y[window - 1:])
+    ends = ends[keep]
+    return ends[(ends - (window - 1)) % stride == 0]
+
+def export_windows(
+    frames: dict[str, pd.DataFrame],
+    out_dir: str | Path,
+    features: Optional[Iterable[str]] = None,
+    window: int = 32,
+    horizon: int = 5,
+    label: Label = forward_return,
+    stride: int = 1,
+    dtype = np.float32,
+    chunk: int = 8192,
+) -> Dataset:
+    """
+    Write [samples, window, features] training tensors for processed frames
+    to memory-mapped .npy files in `out_dir` (X, y, symbol, time, meta.json).
+
+    A sample ending at bar t holds features of bars t-window+1..t and the
+    label computed from bar t onwards, so no feature sees past its label's
+    start. Windows touching a NaN (indicator warm-up, gaps) or with an
+    undefined label are skipped. Windows are strided views of each symbol's
+    feature matrix; only `chunk` samples at a time are gathered into memory
+    on their way to disk, so the output can be larger than RAM.
+    """
+    features = list(features or FEATURES)
+    leaking = set(features) & set(LOOKAHEAD)
+    if leaking:
+        raise ValueError(f'Features computed with lookahead: {sorted(leaking)}')
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    symbols = list(frames)
+
+    # Pass 1: labels and valid windows, to size the files
+    plans = []
+    for symbol in symbols:
+        df = frames[symbol]
+        x = df[features].to_numpy(dtype=dtype)
+        y = label(df, horizon)
+        ends = _valid_ends(x, y, window, stride) if len(x) >= window else np.empty(0, dtype=np.int64)
+        plans.append((x, y, ends))
+    total = sum(len(ends) for *_, ends in plans)
+
+    X = open_memmap(out_dir / 'X.npy', mode='w+', dtype=dtype, shape=(total, window, len(features)))
+    Y = open_memmap(out_dir / 'y.npy', mode='w+', dtype=dtype, shape=(total,))
+    S = open_memmap(out_dir / 'symbol.npy', mode='w+', dtype=np.int32, shape=(total,))
+    T = open_memmap(out_dir / 'time.npy', mode='w+', dtype=np.int64, shape=(total,))
+
+    # Pass 2: gather windows chunk by chunk straight into the memmaps
+    pos = 0
+    for sid, (symbol, (x, y, ends)) in enumerate(zip(symbols, plans)):
+        if not len(ends):
+            continue
+        # [n - window + 1, window, features] view, no copy
+        views = sliding_window_view(x, window, axis=0).transpose(0, 2, 1)
+        times = pd.DatetimeIndex(pd.to_datetime(frames[symbol].index, utc=True)).as_unit('ns').asi8
+
+        for a in range(0, len(ends), chunk):
+            e = ends[a:a + chunk]
+            b = pos + len(e)
+            X[pos:b] = views[e - (window - 1)]
+            Y[pos:b] = y[e]
+            S[pos:b] = sid
+            T[pos:b] = times[e]
+            pos = b
+
+    for m in (X, Y, S, T):
+        m.flush()
+    del X, Y, S, T
+
+    meta = {'samples': total, 'window': window, 'horizon': horizon, 'stride': stride, 'features': features, 'symbols': symbols}
+    (out_dir / 'meta.json').write_text(json.dumps(meta, indent=2))
+    return Dataset(path=out_dir, samples=total, window=window, features=features, symbols=symbols)
+
+def load_dataset(path: str | Path) -> Dataset:
+    path = Path(path)
+    meta = json.loads((path / 'meta.json').read_text())
+    return Dataset(path=path, samples=meta['samples'], window=meta['window'], features=meta['features'], symbols=meta['symbols'])
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Literal, Optional
+import numpy as np
+import pandas as pd
+
+from pstan.backtest import BacktestResult
+
+Method = Literal['bootstrap', 'shuffle']
+
+@dataclass
+class MonteCarloResult:
+    final_equity: np.ndarray  # [paths]
+    max_drawdown: np.ndarray  # [paths], negative fractions
+    curves: pd.DataFrame  # equity percentiles after each trade, one column per percentile
+    stats: dict = field(default_factory=dict)
+
+
+def _returns(trades: BacktestResult | np.ndarray) -> np.ndarray:
+    if isinstance(trades, BacktestResult):
+        trades = trades.trades
+    if trades.dtype.names and 'ret' in trades.dtype.names:
+        return trades['ret'].astype(np.float64)
+    return np.asarray(trades, dtype=np.float64)
+
+def _paths(returns: np.ndarray, n_paths: int, method: Method, initial_cash: float, seed: np.random.SeedSequence) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = len(returns)
+
+    if method == 'bootstrap':
+        # Resample trades with replacement
+        sample = returns[rng.integers(0, n, size=(n_paths, n))]
+    else:
+        # Same trades, random order: final equity is fixed, the path is not
+        sample = rng.permuted(np.tile(returns, (n_paths, 1)), axis=1)
+
+    equity = np.empty((n_paths, n + 1))
+    equity[:, 0] = initial_cash
+    np.cumprod(1 + sample, axis=1, out=equity[:, 1:])
+    equity[:, 1:] *= initial_cash
+    return equity
+
+def monte_carlo(
+    trades: BacktestResult | np.ndarray,
+    n_paths: int = 5000,
+    method: Method = 'bootstrap',
+    initial_cash: float = 1000,
+    percentiles: tuple[float, ...] = (5, 25, 50, 75, 95),
+    seed: Optional[int] = None,
+    workers: int = 1,
+    chunk: int = 2000,
+) -> MonteCarloResult:
+    """
+    Equity/drawdown distribution of a trade list (BacktestResult, TRADE_DTYPE
+    records or plain per-trade returns) over many simulated sequences.
+
+    All paths of a chunk are one [paths, trades] array, so a few thousand
+    paths cost a handful of numpy calls. Chunks get independent seeds
+    spawned from `seed`, which keeps results identical for any `workers`.
+    """
+    returns = _returns(trades)
+    if len(returns) == 0:
+        raise ValueError('No trades to resample')
+
+    sizes = [min(chunk, n_paths - a) for a in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(returns, size, method, initial_cash, s) for size, s in zip(sizes, seeds)]
+
+    if workers > 1:
+        # numpy releases the GIL in the heavy parts, threads are enough
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            equity = np.concatenate(list(pool.map(lambda a: _paths(*a), args)))
+    else:
+        equity = np.concatenate([_paths(*a) for a in args])
+
+    final_equity = equity[:, -1]
+    max_drawdown = (equity / np.maximum.accumulate(equity, axis=1) - 1).min(axis=1)
+
+    curves = pd.DataFrame(
+        np.percentile(equity, percentiles, axis=0).T,
+        columns=[f'p{q:g}' for q in percentiles],
+    )
+    curves.index.name = 'trade'
+
+    final_q = np.percentile(final_equity, percentiles)
+    dd_q = np.percentile(max_drawdown, percentiles)
+    stats = {
+        'paths': len(equity),
+        'trades': len(returns),
+        'prob_loss': float((final_equity < initial_cash).mean()),
+        **{f'final_equity_p{q:g}': float(v) for q, v in zip(percentiles, final_q)},
+        **{f'max_drawdown_p{q:g}': float(v) for q, v in zip(percentiles, dd_q)},
+    }
+
+    return MonteCarloResult(final_equity=final_equity, max_drawdown=max_drawdown, curves=curves, stats=stats)
@@ -0,0 +1,226 @@
+import itertools
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+from pstan.backtest import backtest_arrays, equity_curve, make_trades, trade_stats
+from pstan.processors.atr import ATR
+from pstan.scan import default_processors
+from pstan.utils.pipe import pipe
+
+# Parameters and their defaults, grouped by which computation they invalidate:
+# window -> every indicator, thresholds -> Signal, trade params -> backtest only.
+# Only thresholds Signals reads belong here (it doesn't use Boll_squeeze)
+DEFAULTS = {
+    'window': 16,
+    'atr_break_threshold': 1.6,
+    'stop_loss_pct': 0.02,
+    'profit_ratio': 1.5,
+}
+SIGNAL_PARAMS = ('atr_break_threshold',)
+TRADE_PARAMS = ('stop_loss_pct', 'profit_ratio')
+
+def grid(**params: Iterable[Any]) -> list[dict]:
+    """Cartesian product of parameter values, unset parameters use DEFAULTS"""
+    unknown = set(params) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f'Unknown parameters: {sorted(unknown)}')
+
+    values = {k: list(params.get(k, [v])) for k, v in DEFAULTS.items()}
+    return [dict(zip(values, combo)) for combo in itertools.product(*values.values())]
+
+def splits(n: int, folds: int = 0, train_size: float = 0.7) -> dict[str, tuple[int, int]]:
+    """
+    Bar ranges to backtest. folds=0 is the whole series, otherwise rolling
+    walk-forward windows: fold k trains on `train_size` of the data and
+    tests on the following 1/folds of the remainder.
+    """
+    if folds <= 0:
+        return {'full': (0, n)}
+
+    train_len = int(n * train_size)
+    test_len = (n - train_len) // folds
+    result = {}
+    for k in range(folds):
+        start = k * test_len
+        result[f'{k}:train'] = (start, start + train_len)
+        result[f'{k}:test'] = (start + train_len, start + train_len + test_len)
+    return result
+
+def result_key(symbol: str, segment: str, params: dict) -> str:
+    return f'{symbol}|{segment}|{json.dumps(params, sort_keys=True)}'
+
+
+_frames: dict[str, pd.DataFrame] = {}
+
+def _init_worker(frames: dict[str, pd.DataFrame]) -> None:
+    # Ship the price data once per worker instead of once per task
+    global _frames
+    _frames = frames
+
+def _evaluate(
+    symbol: str,
+    window: int,
+    signal_params: list[tuple[float]],
+    trade_params: list[tuple[float, float]],
+    folds: int,
+    train_size: float,
+    done: set[str],
+    compat: bool,
+) -> list[dict]:
+    """
+    Evaluate every (signal, trade) combination for one symbol and window.
+    Indicators are computed once, Signal once per threshold, and only
+    the backtest runs per trade parameter pair and segment.
+    """
+    processors = default_processors(window)
+    signals = processors.pop('signals')
+    df, _ = pipe(pd.DataFrame(_frames[symbol]), **processors)
+
+    close = df['Close'].to_numpy(dtype=np.float64)
+    high = None if compat else df['High'].to_numpy(dtype=np.float64)
+    low = None if compat else df['Low'].to_numpy(dtype=np.float64)
+    opens = None if compat else df['Open'].to_numpy(dtype=np.float64)
+    segments = splits(len(df), folds, train_size)
+
+    rows = []
+    for (atr_break_threshold,) in signal_params:
+        signal = signals.process(df.assign(
+            ATR_break=ATR(window=window*2, break_threshold=atr_break_threshold).breaks(df),
+        ))['Signal'].to_numpy(dtype=bool)
+
+        for stop_loss_pct, profit_ratio in trade_params:
+            params = {
+                'window': window,
+                'atr_break_threshold': atr_break_threshold,
+                'stop_loss_pct': stop_loss_pct,
+                'profit_ratio': profit_ratio,
+            }
+            for segment, (a, b) in segments.items():
+                key = result_key(symbol, segment, params)
+                if key in done:
+                    continue
+
+                trades, _ = backtest_arrays(
+                    close[a:b], signal[a:b],
+                    high=None if compat else high[a:b],
+                    low=None if compat else low[a:b],
+                    open=None if compat else opens[a:b],
+                    stop_loss_pct=stop_loss_pct,
+                    profit_ratio=profit_ratio,
+                )
+                trades = make_trades(trades)
+                equity = equity_curve(b - a, trades['exit_idx'], trades['ret'] + 1, 1.0)
+                rows.append({
+                    'key': key,
+                    'symbol': symbol,
+                    'segment': segment,
+                    **params,
+                    **trade_stats(trades, equity, 1.0),
+                })
+    return rows
+
+def _read_results(path: Path) -> list[dict]:
+    rows = []
+    if not path.exists():
+        return rows
+
+    good = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+            good += len(line)
+
+    # Drop the partial line an interrupted run may have left, so appends start clean
+    if good < path.stat().st_size:
+        os.truncate(path, good)
+    return rows
+
+def optimize(
+    frames: dict[str, pd.DataFrame],
+    params: list[dict],
+    out_path: str | Path,
+    folds: int = 0,
+    train_size: float = 0.7,
+    workers: Optional[int] = None,
+    compat: bool = False,
+) -> pd.DataFrame:
+    """
+    Evaluate a parameter grid (see grid()) on OHLCV frames in a process pool.
+
+    Each result row is appended to `out_path` as NDJSON as soon as its task
+    finishes. Rerunning with the same path skips rows already there, so an
+    interrupted run resumes where it stopped.
+    """
+    out_path = Path(out_path)
+    existing = _read_results(out_path)
+    done = {row['key'] for row in existing}
+
+    # window -> {signal param tuples}, {trade param pairs}
+    by_window: dict[int, tuple[set, set]] = defaultdict(lambda: (set(), set()))
+    for p in params:
+        p = {**DEFAULTS, **p}
+        sig, trade = by_window[p['window']]
+        sig.add(tuple(p[k] for k in SIGNAL_PARAMS))
+        trade.add(tuple(p[k] for k in TRADE_PARAMS))
+
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    for symbol in frames:
+        for window, (sig, trade) in by_window.items():
+            sig = sorted(sig)
+            # Split signal params when there are too few tasks to keep every worker busy
+            chunks = max(1, min(len(sig), workers // max(1, len(frames) * len(by_window))))
+            for chunk in np.array_split(np.arange(len(sig)), chunks):
+                tasks.append((symbol, window, [sig[i] for i in chunk], sorted(trade)))
+
+    rows = existing
+    with open(out_path, 'a') as out, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(frames,)
+    ) as pool:
+        futures = [
+            pool.submit(_evaluate, symbol, window, sig, trade, folds, train_size,
+                        {k for k in done if k.startswith(f'{symbol}|')}, compat)
+            for symbol, window, sig, trade in tasks
+        ]
+        for future in as_completed(futures):
+            for row in future.result():
+                out.write(json.dumps(row, default=float) + '\n')
+                rows.append(row)
+            out.flush()
+
+    return pd.DataFrame(rows)
+
+def walk_forward(results: pd.DataFrame, metric: str = 'total_return') -> pd.DataFrame:
+    """
+    Per symbol and fold, pick the parameters with the best train `metric`
+    and report how they did on the fold's test segment. Needs results from
+    optimize() with folds >= 1.
+    """
+    walk = results['segment'].str.fullmatch(r'\d+:(train|test)') if len(results) else pd.Series(dtype=bool)
+    if not walk.any() or not walk.all():
+        found = sorted(results.loc[~walk, 'segment'].unique()) if len(results) else 'no results'
+        raise ValueError(f'walk_forward needs fold:train/test segments from optimize(folds>=1), got {found}')
+
+    segment = results['segment'].str.split(':', expand=True)
+    results = results.assign(fold=segment[0], split=segment[1])
+    param_cols = list(DEFAULTS)
+
+    train = results[results['split'] == 'train']
+    test = results[results['split'] == 'test']
+
+    best = train.loc[train.groupby(['symbol', 'fold'])[metric].idxmax().dropna()]
+    report = best[['symbol', 'fold', *param_cols, metric]].merge(
+        test[['symbol', 'fold', *param_cols, metric]],
+        on=['symbol', 'fold', *param_cols],
+        suffixes=('_train', '_test'),
+    )
+    return report.sort_values(['symbol', 'fold']).reset_index(drop=True)
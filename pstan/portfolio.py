@@ -1,5 +1,7 @@
 import pandas as pd
 
+from pstan.backtest import BacktestResult, backtest
+
 class Portfolio:
 
     def __init__(self,
@@ -11,44 +13,30 @@ class Portfolio:
         self.stop_loss_pct = stop_loss_pct
         self.profit_ratio = profit_ratio
         self.take_profit_pct = stop_loss_pct * profit_ratio
-
-    def run(self, df: pd.DataFrame):
-        cash = self.initial_cash
-        in_trade = False
-        entry_price = 0
-        entry_date = None
-        trades = []
-        portfolio_values = []
-
-        target_price = 0
-        stop_price = 0
-
-        for i in range(len(df)):
-            price = df['Close'].iloc[i]
-            date = df['date'].iloc[i]
-
-            if not in_trade:
-                if df['Buy_Signal'].iloc[i] == 1:
-                    entry_price = price
-                    stop_price = entry_price * (1 - self.stop_loss_pct)
-                    target_price = entry_price * (1 + self.take_profit_pct)
-                    entry_date = date
-                    in_trade = True
-                    print(f"BUY at {entry_price:.2f} on {date.date()} | Target: {target_price:.2f}, Stop: {stop_price:.2f}")
-            else:
-                if price >= target_price:
-                    cash = cash * (target_price / entry_price)
-                    print(f"SELL (TP HIT) at {target_price:.2f} on {date.date()} | Portfolio: {cash:.2f}")
-                    trades.append((entry_date, date, entry_price, target_price, 'win'))
-                    in_trade = False
-                elif price <= stop_price:
-                    cash = cash * (stop_price / entry_price)
-                    print(f"SELL (STOP HIT) at {stop_price:.2f} on {date.date()} | Portfolio: {cash:.2f}")
-                    trades.append((entry_date, date, entry_price, stop_price, 'loss'))
-                    in_trade = False
-
-            portfolio_values.append(cash)
-
-        df['Portfolio'] = portfolio_values
-
-
+        self.result: BacktestResult | None = None
+
+    def run(self, df: pd.DataFrame, verbose: bool = True) -> BacktestResult:
+        # Close-only stops/targets, same as the original bar-by-bar loop
+        result = backtest(
+            df,
+            stop_loss_pct=self.stop_loss_pct,
+            profit_ratio=self.profit_ratio,
+            initial_cash=self.initial_cash,
+            compat=True,
+        )
+
+        if verbose:
+            dates = df['date']
+            for t in result.trades:
+                entry_price, exit_price = t['entry_price'], t['exit_price']
+                cash = result.equity[t['exit_idx']]
+                print(f"BUY at {entry_price:.2f} on {dates.iloc[t['entry_idx']].date()} | Target: {entry_price * (1 + self.take_profit_pct):.2f}, Stop: {entry_price * (1 - self.stop_loss_pct):.2f}")
+                kind = 'TP HIT' if t['win'] else 'STOP HIT'
+                print(f"SELL ({kind}) at {exit_price:.2f} on {dates.iloc[t['exit_idx']].date()} | Portfolio: {cash:.2f}")
+            if result.open_trade is not None:
+                entry_price = df['Close'].iloc[result.open_trade]
+                print(f"BUY at {entry_price:.2f} on {dates.iloc[result.open_trade].date()} | Target: {entry_price * (1 + self.take_profit_pct):.2f}, Stop: {entry_price * (1 - self.stop_loss_pct):.2f}")
+
+        df['Portfolio'] = result.equity
+        self.result = result
+        return result
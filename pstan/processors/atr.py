@@ -19,6 +19,10 @@ class ATR(Processor):
         low_close = (df['Low'] - df['Close'].shift()).abs()
 
         return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+
+    def breaks(self, df: pd.DataFrame) -> pd.Series:
+        # Only part of process() that depends on break_threshold
+        return (df['Gain'] > 0) & (df['Gain'] > (self.break_threshold * df['ATR'])) #| (df['Range'] > self.break_threshold * df['ATR'])
     
     def process(self, df: pd.DataFrame):
         df = df.copy()
@@ -29,7 +33,7 @@ class ATR(Processor):
         df['ATR_trend'] = df['ATR'].diff()
         df['ATR_compression'] = (df['ATR'] < df['ATR'].rolling(self.window).mean() * self.compression_threshold)
 
-        df['ATR_break'] = (df['Gain'] > 0) & (df['Gain'] > (self.break_threshold * df['ATR'])) #| (df['Range'] > self.break_threshold * df['ATR'])
+        df['ATR_break'] = self.breaks(df)
 
         return df
 
@@ -1,11 +1,23 @@
 import pandas as pd
 import numpy as np
 from pstan.processors import Processor
-from pstan.utils.process import normalize
+from pstan.sessions import POST, PRE, REGULAR, SessionCalendar
+from pstan.utils.process import normalize, segment_starts, segmented_cummax, segmented_cummin, segmented_cumsum
 
 class Base(Processor):
-    def __init__(self, window = 16):
+    def __init__(self, window = 16, exchange = 'XNYS', opening_range = 30):
         self.window = window
+        self.calendar = SessionCalendar(exchange) if exchange else None
+        self.opening_range = pd.Timedelta(minutes=opening_range)
+
+    def sessions(self, df: pd.DataFrame):
+        """Calendar labels for intraday bars, None when the index can't be labelled"""
+        if self.calendar is None or not isinstance(df.index, pd.DatetimeIndex) or len(df) < 2:
+            return None
+        # Daily and slower bars are sessions already
+        if (df.index[1:] - df.index[:-1]).median() >= pd.Timedelta(days=1):
+            return None
+        return self.calendar.label(df.index)
 
     def efficiency_ratio(self, series, period = 12):
         change = abs(series.diff(period))
@@ -14,6 +26,7 @@ class Base(Processor):
 
     def process(self, df: pd.DataFrame):
         df = df.copy()
+        sessions = self.sessions(df)
 
         # Need to convert dates to string to easily align bar charts and lines
         df.index = df.index.astype(str)
@@ -24,9 +37,15 @@ class Base(Processor):
         df['Volume_valid'] = df['Volume'].replace(0, np.nan)
         df['Volume_ff'] = df['Volume_valid'].ffill()
 
-        # Mark regular vs pre/post market hours (yfinance sets volume=0 for pre/post)
-        df['Is_regular_hours'] = df['Volume_raw'] > 0
-        df['Is_prepost'] = ~df['Is_regular_hours']
+        if sessions is not None:
+            # Mark regular vs pre/post market hours from the exchange calendar
+            df['Session_id'] = sessions['session_id'].to_numpy()
+            df['Is_regular_hours'] = sessions['segment'].to_numpy() == REGULAR
+            df['Is_prepost'] = np.isin(sessions['segment'].to_numpy(), (PRE, POST))
+        else:
+            # Without timestamps, fall back to yfinance setting volume=0 for pre/post
+            df['Is_regular_hours'] = df['Volume_raw'] > 0
+            df['Is_prepost'] = ~df['Is_regular_hours']
 
         df['Volume_n'] = normalize(df['Volume'])
         df['Close_n'] = normalize(df['Close'])
@@ -65,8 +84,12 @@ class Base(Processor):
         df['Money_flow_ratio'] = df['Money_flow'] / df['Money_flow'].rolling(self.window).mean()
 
         # --- High of Day Breaks ---
-        df['HOD'] = df['High'].expanding().max()  # High of day
-        df['New_HOD'] = df['High'] >= df['HOD'].shift(1)  # Breaking into new HOD
+        if sessions is not None:
+            self.process_sessions(df, sessions)
+        else:
+            df['HOD'] = df['High'].expanding().max()  # High of history, no sessions to reset on
+            df['LOD'] = df['Low'].expanding().min()
+            df['New_HOD'] = df['High'] >= df['HOD'].shift(1)  # Breaking into new HOD
         df['HOD_break'] = df['New_HOD'] & (df['Close'] > df['Open'])  # Green at HOD
 
         # --- Consecutive Green Candles & Momentum ---
@@ -77,6 +100,41 @@ class Base(Processor):
 
         return df
 
+    def process_sessions(self, df: pd.DataFrame, sessions: pd.DataFrame):
+        """Per-session metrics as segmented scans over Session_id, in place"""
+        ids = df['Session_id'].to_numpy()
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        volume = df['Volume_raw'].to_numpy(dtype=np.float64)
+
+        # --- High/Low of Day (reset every session) ---
+        hod = segmented_cummax(high, ids)
+        df['HOD'] = hod
+        df['LOD'] = segmented_cummin(low, ids)
+        prev_hod = np.roll(hod, 1)
+        prev_hod[segment_starts(ids)] = np.nan  # First bar of a session has nothing to break
+        df['New_HOD'] = high >= prev_hod
+
+        # --- Session VWAP / cumulative volume ---
+        session_volume = segmented_cumsum(volume, ids)
+        df['Session_volume'] = session_volume
+        df['Session_vwap'] = segmented_cumsum(df['Typical_price'].to_numpy() * volume, ids) / np.where(session_volume > 0, session_volume, np.nan)
+        df['Above_vwap'] = df['Close'] > df['Session_vwap']
+
+        # --- Opening Range ---
+        # High/low of the first `opening_range` of regular trading, only
+        # known (and published) once the range has closed
+        range_end = sessions['session_open'] + self.opening_range
+        in_range = df['Is_regular_hours'].to_numpy() & (sessions['time'] < range_end).to_numpy()
+        after = (sessions['time'] >= range_end).to_numpy()
+
+        group = np.cumsum(segment_starts(ids))
+        orh = pd.Series(np.where(in_range, high, np.nan)).groupby(group).transform('max').to_numpy()
+        orl = pd.Series(np.where(in_range, low, np.nan)).groupby(group).transform('min').to_numpy()
+        df['OR_high'] = np.where(after, orh, np.nan)
+        df['OR_low'] = np.where(after, orl, np.nan)
+        df['OR_breakout'] = df['Is_regular_hours'] & (df['Close'] > df['OR_high'])
+
     @staticmethod
     def plot_prepost(df: pd.DataFrame, ax):
         for idx in df.index[df['Is_prepost']]:
@@ -18,6 +18,10 @@ class Boll(Processor):
         bband_std = rolling.std(ddof=0)
 
         return tuple((bband0 + (bband_std * num_std)) for num_std in num_stds)
+
+    def squeeze(self, df: pd.DataFrame) -> pd.Series:
+        # Only part of process() that depends on squeeze_threshold
+        return (df['Boll_w'] < df['Boll_w_avg'] * self.squeeze_threshold)
     
     def process(self, df: pd.DataFrame):
         df = df.copy()
@@ -26,7 +30,7 @@ class Boll(Processor):
 
         df['Boll_w'] = df['Boll_h'] - df['Boll_l']
         df['Boll_w_avg'] = df['Boll_w'].rolling(self.window).mean()
-        df['Boll_squeeze'] = (df['Boll_w'] < df['Boll_w_avg'] * self.squeeze_threshold)
+        df['Boll_squeeze'] = self.squeeze(df)
         df['Boll_breakout_h'] = (df['Close'] > df['Boll_h'])
         df['Boll_breakout_l'] = (df['Close'] < df['Boll_l'])
         df['Boll_pct'] = (df['Close'] - df['Boll_l']) / (df['Boll_h'] - df['Boll_l'])
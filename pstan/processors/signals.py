@@ -6,8 +6,10 @@ class Signals(Processor):
     def __init__(
         self, 
         window = 16,
+        min_rs_rank = None,
     ):
         self.window = window
+        self.min_rs_rank = min_rs_rank  # Only signal symbols leading their universe (see pstan.relative)
     
     def process(self, df: pd.DataFrame):
         df = df.copy()
@@ -28,6 +30,9 @@ class Signals(Processor):
             (df['Boll_breakout_h'].rolling(self.window//2).max() == 1) & \
             (df['Boll_w'].diff() > 0) 
 
+        if self.min_rs_rank is not None and 'RS_rank' in df:
+            df['Signal'] &= df['RS_rank'] >= self.min_rs_rank
+
         return df
 
     def print(self, df):
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from pstan.processors import Processor
+from pstan.utils.rolling import rolling_median, rolling_rank
 
 class Volume(Processor):
     def __init__(
@@ -54,6 +55,15 @@ class Volume(Processor):
             df['Volume'].rolling(self.window).std()
         )
 
+        # --- Robust baselines (order statistics, not skewed by single spikes) ---
+        df['Volume_median'] = rolling_median(df['Volume_valid'], self.window*2, min_periods=self.window//2)
+        df['Volume_ratio_median'] = np.where(
+            df['Is_regular_hours'],
+            df['Volume'] / df['Volume_median'],
+            np.nan
+        )
+        df['Volume_pct_rank'] = rolling_rank(df['Volume_valid'], self.window*2, min_periods=self.window//2)
+
         # Buying/Selling Pressure within candle
         df['Volume_sentiment'] = np.where(
             df['High'] != df['Low'],
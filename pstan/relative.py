@@ -0,0 +1,160 @@
+from collections import deque
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+def returns_panel(frames: dict[str, pd.DataFrame], column: str = 'Close') -> pd.DataFrame:
+    """[time, symbol] simple returns, outer-joined on parsed UTC timestamps"""
+    closes = {}
+    for symbol, df in frames.items():
+        s = df[column].astype(np.float64)
+        s.index = pd.to_datetime(df.index, utc=True)
+        closes[symbol] = s[~s.index.duplicated(keep='last')]
+    # No fill: a missing bar is a missing return, not a zero one
+    return pd.DataFrame(closes).sort_index().pct_change(fill_method=None)
+
+
+class RollingCorrelation:
+    """
+    Pairwise rolling correlation of N return series, maintained by rank-1
+    updates of the window sums: each bar adds its outer products and
+    subtracts those of the bar leaving the window, O(N^2) per bar instead of
+    O(window * N^2) for a recompute. Pairs only count bars where both
+    returns exist. Sums are rebuilt from the buffer every `refresh` updates
+    so add/subtract rounding cannot drift.
+    """
+
+    def __init__(self, symbols: list[str], window: int = 64, refresh: Optional[int] = None):
+        self.symbols = list(symbols)
+        self.window = window
+        self.refresh = refresh or window * 16
+        n = len(self.symbols)
+        self._buffer: deque[np.ndarray] = deque()
+        self._n = np.zeros((n, n))
+        self._sx = np.zeros((n, n))  # sum of x_i over bars where i and j exist
+        self._sxx = np.zeros((n, n))
+        self._sxy = np.zeros((n, n))
+        self._updates = 0
+
+    def _apply(self, x: np.ndarray, sign: float) -> None:
+        valid = ~np.isnan(x)
+        m = valid.astype(np.float64)
+        x = np.where(valid, x, 0.0)
+        self._n += sign * np.outer(m, m)
+        self._sx += sign * np.outer(x, m)
+        self._sxx += sign * np.outer(x * x, m)
+        self._sxy += sign * np.outer(x, x)
+
+    def update(self, returns: np.ndarray) -> None:
+        """Push one bar of returns, ordered like `symbols`"""
+        returns = np.asarray(returns, dtype=np.float64)
+        self._buffer.append(returns)
+        self._apply(returns, 1.0)
+        if len(self._buffer) > self.window:
+            self._apply(self._buffer.popleft(), -1.0)
+
+        self._updates += 1
+        if self._updates % self.refresh == 0:
+            for s in (self._n, self._sx, self._sxx, self._sxy):
+                s[:] = 0
+            for row in self._buffer:
+                self._apply(row, 1.0)
+
+    def corr(self, min_periods: Optional[int] = None) -> pd.DataFrame:
+        min_periods = self.window // 2 if min_periods is None else min_periods
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n = np.where(self._n >= max(min_periods, 2), self._n, np.nan)
+            mean_i, mean_j = self._sx / n, self._sx.T / n
+            cov = self._sxy / n - mean_i * mean_j
+            var_i = self._sxx / n - mean_i ** 2
+            var_j = self._sxx.T / n - mean_j ** 2
+            corr = np.clip(cov / np.sqrt(var_i * var_j), -1, 1)
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+    def peers(self, symbol: str, k: int = 5) -> pd.Series:
+        """The k symbols most correlated with `symbol` over the window"""
+        row = self.corr()[symbol].drop(symbol)
+        return row.dropna().nlargest(k)
+
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame, window: int = 64) -> 'RollingCorrelation':
+        state = cls(list(returns.columns), window)
+        for row in returns.to_numpy(dtype=np.float64):
+            state.update(row)
+        return state
+
+
+def _window_sum(a: np.ndarray, window: int) -> np.ndarray:
+    # Rolling sum along axis 0 from cumulative sums: add the new bar, drop the old
+    c = np.cumsum(a, axis=0)
+    c[window:] = c[window:] - c[:-window]
+    return c
+
+def basket_correlation(returns: pd.DataFrame, window: int = 64, basket: Optional[pd.Series] = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Rolling correlation and beta of every symbol against a basket (default:
+    equal-weight mean of the universe), for all bars at once from rolling
+    window sums.
+    """
+    x = returns.to_numpy(dtype=np.float64)
+    y = (returns.mean(axis=1) if basket is None else basket.reindex(returns.index)).to_numpy(dtype=np.float64)[:, None]
+
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    m = valid.astype(np.float64)
+    x0 = np.where(valid, x, 0.0)
+    y0 = np.where(valid, y, 0.0)
+
+    n = _window_sum(m, window)
+    sx, sy = _window_sum(x0, window), _window_sum(y0, window)
+    sxx, syy, sxy = _window_sum(x0 * x0, window), _window_sum(y0 * y0, window), _window_sum(x0 * y0, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = np.where(n >= max(window // 2, 2), n, np.nan)
+        cov = sxy / n - (sx / n) * (sy / n)
+        var_x = sxx / n - (sx / n) ** 2
+        var_y = syy / n - (sy / n) ** 2
+        corr = np.clip(cov / np.sqrt(var_x * var_y), -1, 1)
+        beta = cov / var_y
+
+    return (
+        pd.DataFrame(corr, index=returns.index, columns=returns.columns),
+        pd.DataFrame(beta, index=returns.index, columns=returns.columns),
+    )
+
+def relative_strength(returns: pd.DataFrame, lookback: int = 16, basket: Optional[pd.Series] = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Excess compounded return over `lookback` bars vs the basket, and its
+    cross-sectional percentile rank per bar (1 = strongest in the universe).
+    """
+    growth = np.log1p(returns)
+    basket = growth.mean(axis=1) if basket is None else np.log1p(basket.reindex(returns.index))
+    sym = growth.rolling(lookback, min_periods=lookback // 2).sum()
+    ref = basket.rolling(lookback, min_periods=lookback // 2).sum()
+    rs = np.expm1(sym.sub(ref, axis=0))
+    return rs, rs.rank(axis=1, pct=True)
+
+def add_relative(
+    frames: dict[str, pd.DataFrame],
+    window: int = 64,
+    lookback: int = 16,
+    basket: Optional[pd.Series] = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Add RS, RS_rank, Corr_basket and Beta_basket columns to each processed
+    frame. Run it between the per-symbol indicators and Signals, which can
+    then gate on RS_rank (see Signals.min_rs_rank).
+    """
+    returns = returns_panel(frames)
+    corr, beta = basket_correlation(returns, window, basket)
+    rs, rs_rank = relative_strength(returns, lookback, basket)
+
+    result = {}
+    for symbol, df in frames.items():
+        times = pd.to_datetime(df.index, utc=True)
+        result[symbol] = df.assign(
+            RS=rs[symbol].reindex(times).to_numpy(),
+            RS_rank=rs_rank[symbol].reindex(times).to_numpy(),
+            Corr_basket=corr[symbol].reindex(times).to_numpy(),
+            Beta_basket=beta[symbol].reindex(times).to_numpy(),
+        )
+    return result
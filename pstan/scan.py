@@ -0,0 +1,203 @@
+import heapq
+import math
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Iterable, Literal, Optional
+import pandas as pd
+
+from pstan.data.yfinance import Interval, fetch_data_yfinance, fetch_data_yfinance_cached
+from pstan.processors.base import Base
+from pstan.processors.boll import Boll
+from pstan.processors.macd import MACD
+from pstan.processors.pressure import Pressure
+from pstan.processors.rsi import RSI
+from pstan.processors.volume import Volume
+from pstan.processors.atr import ATR
+from pstan.processors.signals import Signals
+from pstan.signalstore import SignalStore, events_from_frame
+from pstan.utils.pipe import pipe
+from pstan.utils.profiler import Profiler
+
+Mode = Literal['serial', 'thread', 'process']
+
+# Weight of each recent event/metric in a symbol's signal strength
+STRENGTH_WEIGHTS = {
+    'signals': 10.0,
+    'atr_breaks': 3.0,
+    'macd_buys': 2.0,
+    'volume_ratio': 1.0,
+}
+
+def default_processors(window: int = 16, atr_break_threshold: float = 1.6, boll_squeeze_threshold: float = 0.7) -> dict[str, Any]:
+    """The processor chain used by analysis.get_metrics"""
+    return dict(
+        base = Base(window=window),
+        vol = Volume(window=window),
+        rsi = RSI(window=window),
+        macd = MACD(),
+        boll = Boll(window=window*2, squeeze_threshold=boll_squeeze_threshold),
+        atr = ATR(window=window*2, break_threshold=atr_break_threshold),
+        bsp = Pressure(window=window),
+        signals = Signals(window=window),
+    )
+
+def load_universe(path: str | Path) -> list[str]:
+    """Symbols separated by whitespace/commas, '#' starts a comment"""
+    symbols = []
+    for line in Path(path).read_text().splitlines():
+        line = line.split('#', 1)[0]
+        symbols.extend(s.strip().upper() for s in line.replace(',', ' ').split())
+    return list(dict.fromkeys(s for s in symbols if s))
+
+def signal_strength(df: pd.DataFrame, recent: int) -> dict:
+    tail = df.tail(recent)
+    volume_ratio = tail['Volume_ratio'].max()
+
+    row = {
+        'signals': int(tail['Signal'].sum()),
+        'atr_breaks': int(tail['ATR_break'].sum()),
+        'macd_buys': int(tail['MACD_buy_signal'].sum()),
+        'volume_ratio': 0.0 if math.isnan(volume_ratio) else round(float(volume_ratio), 3),
+    }
+    row['strength'] = round(sum(row[k] * w for k, w in STRENGTH_WEIGHTS.items()), 3)
+
+    fired = df.index[df['Signal'].astype(bool)]
+    row['last_signal'] = fired[-1] if len(fired) else None
+    row['close'] = round(float(df['Close'].iloc[-1]), 4)
+    row['rsi'] = round(float(df['RSI'].iloc[-1]), 2)
+    return row
+
+def scan_symbol(
+    symbol: str,
+    interval: Interval,
+    period: timedelta,
+    window: int = 16,
+    recent: int = 3,
+    prepost: bool = False,
+    use_cache: bool = True,
+    profile: Optional[dict] = None,
+) -> tuple[str, Optional[dict], dict[str, float], Optional[pd.DataFrame], list[dict]]:
+    """
+    Fetch and process one symbol. Module level so process pools can pickle it.
+    Besides the ranking row, returns the symbol's sparse signal events and,
+    when `profile` holds Profiler options, the spans recorded for it.
+    """
+    timings = {'fetch': 0.0, 'process': 0.0}
+    profiler = Profiler(**profile) if profile is not None else None
+
+    t = time.perf_counter()
+    fetch = fetch_data_yfinance_cached if use_cache else fetch_data_yfinance
+    with profiler.span('fetch', symbol=symbol) if profiler else nullcontext():
+        df = fetch(symbol=symbol, interval=interval, period=period, prepost=prepost)
+    timings['fetch'] = time.perf_counter() - t
+    spans = profiler.spans if profiler else []
+
+    if df is None or len(df) < window * 2:
+        return symbol, None, timings, None, spans
+
+    t = time.perf_counter()
+    if profiler:
+        with profiler.span('process', symbol=symbol):
+            df, _ = pipe(pd.DataFrame(df), profiler, **default_processors(window))
+    else:
+        df, _ = pipe(pd.DataFrame(df), **default_processors(window))
+    row = {'symbol': symbol, **signal_strength(df, recent)}
+    events = events_from_frame(df)
+    timings['process'] = time.perf_counter() - t
+
+    return symbol, row, timings, events, spans
+
+def _executor(mode: Mode, workers: int) -> Optional[Executor]:
+    if mode == 'thread':
+        return ThreadPoolExecutor(max_workers=workers)
+    if mode == 'process':
+        return ProcessPoolExecutor(max_workers=workers)
+    return None
+
+def run_scan(
+    symbols: Iterable[str],
+    interval: Interval = '5m',
+    period: timedelta = timedelta(days=5),
+    window: int = 16,
+    recent: int = 3,
+    top: int = 20,
+    mode: Mode = 'thread',
+    workers: int = 8,
+    prepost: bool = False,
+    use_cache: bool = True,
+    store: Optional[SignalStore] = None,
+    profiler: Optional[Profiler] = None,
+) -> tuple[list[dict], dict[str, float]]:
+    """
+    Scan a universe and keep the `top` symbols by signal strength.
+
+    Results are pushed through a heap bounded at `top` entries as they
+    arrive, so memory and ranking cost don't grow with the universe.
+    Returns the ranked rows and per-stage timings (seconds; fetch/process
+    are summed over workers, wall is elapsed time). Signal events of every
+    scanned symbol are appended to `store` when given, and per-symbol
+    fetch/processor spans (recorded in the workers) are merged into
+    `profiler`.
+    """
+    if top < 1:
+        raise ValueError(f'top must be at least 1, got {top}')
+
+    symbols = list(symbols)
+    timings = {'fetch': 0.0, 'process': 0.0, 'rank': 0.0, 'wall': 0.0, 'symbols': len(symbols), 'skipped': 0, 'errors': 0}
+    heap: list[tuple[float, int, dict]] = []
+    start = time.perf_counter()
+
+    def collect(seq: int, result: tuple[str, Optional[dict], dict[str, float], Optional[pd.DataFrame], list[dict]]) -> None:
+        symbol, row, stage, events, spans = result
+        for k, v in stage.items():
+            timings[k] += v
+
+        if profiler is not None:
+            profiler.extend(spans)
+
+        if store is not None and events is not None:
+            store.add_events(symbol, events)
+
+        if row is None:
+            timings['skipped'] += 1
+            return
+
+        t = time.perf_counter()
+        item = (row['strength'], -seq, row)
+        if len(heap) < top:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+        timings['rank'] += time.perf_counter() - t
+
+    profile = {'memory': profiler.memory, 'columns': profiler.columns} if profiler is not None else None
+    args = (interval, period, window, recent, prepost, use_cache, profile)
+    executor = _executor(mode, workers)
+
+    if executor is None:
+        for seq, symbol in enumerate(symbols):
+            try:
+                collect(seq, scan_symbol(symbol, *args))
+            except Exception as e:
+                timings['errors'] += 1
+                print(f'{symbol}: {e!r}', file=sys.stderr)
+    else:
+        with executor:
+            futures = {executor.submit(scan_symbol, symbol, *args): seq for seq, symbol in enumerate(symbols)}
+            for future in as_completed(futures):
+                try:
+                    collect(futures[future], future.result())
+                except Exception as e:
+                    timings['errors'] += 1
+                    print(f'{symbols[futures[future]]}: {e!r}', file=sys.stderr)
+
+    t = time.perf_counter()
+    rows = [row for *_, row in sorted(heap, reverse=True)]
+    timings['rank'] += time.perf_counter() - t
+    timings['wall'] = time.perf_counter() - start
+
+    return rows, timings
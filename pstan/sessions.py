@@ -0,0 +1,139 @@
+from datetime import date, timedelta
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Segment codes returned by SessionCalendar.label
+CLOSED, PRE, REGULAR, POST = 0, 1, 2, 3
+
+# Local session boundaries per exchange; early closes end regular trading
+# at `early_close` and extended hours at `early_post`
+EXCHANGES = {
+    'XNYS': dict(tz='America/New_York', pre='04:00', open='09:30', close='16:00', post='20:00', early_close='13:00', early_post='17:00'),
+}
+EXCHANGES['XNAS'] = EXCHANGES['XNYS']
+EXCHANGES['US'] = EXCHANGES['XNYS']
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    # n-th (1-based, -1 = last) given weekday of the month
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _observed(d: date) -> date:
+    # Saturday holidays move to Friday, Sunday holidays to Monday
+    return d - timedelta(days=1) if d.weekday() == 5 else d + timedelta(days=1) if d.weekday() == 6 else d
+
+def us_holidays(year: int) -> tuple[set[date], set[date]]:
+    """NYSE full holidays and early (13:00) closes for a year"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Presidents' Day
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),
+    }
+    # New Year's Day on a Saturday is not moved back into the old year
+    if date(year, 1, 1).weekday() != 5:
+        holidays.add(_observed(date(year, 1, 1)))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+
+    early = {
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),  # Black Friday
+        date(year, 12, 24),
+    }
+    early = {d for d in early if d.weekday() < 5 and d not in holidays}
+    return holidays, early
+
+
+@lru_cache(maxsize=64)
+def _year(exchange: str, year: int) -> pd.DataFrame:
+    spec = EXCHANGES[exchange]
+    holidays, early = us_holidays(year)
+    days = [d.date() for d in pd.date_range(f'{year}-01-01', f'{year}-12-31', freq='B') if d.date() not in holidays]
+    is_early = np.array([d in early for d in days], dtype=bool)
+
+    def at(times) -> pd.DatetimeIndex:
+        local = pd.to_datetime([f'{d} {t}' for d, t in zip(days, times)])
+        return local.tz_localize(spec['tz']).tz_convert('UTC')
+
+    n = len(days)
+    return pd.DataFrame({
+        'pre_open': at([spec['pre']] * n),
+        'open': at([spec['open']] * n),
+        'close': at(np.where(is_early, spec['early_close'], spec['close'])),
+        'post_close': at(np.where(is_early, spec['early_post'], spec['post'])),
+        'early_close': is_early,
+    }, index=pd.Index(days, name='date'))
+
+
+class SessionCalendar:
+    """
+    Precomputed pre/regular/post boundaries per trading day.
+
+    label() maps a DatetimeIndex to a session id (the trading day, shared by
+    its pre, regular and post segments) and a segment code with one
+    searchsorted over the flattened boundaries.
+    """
+
+    def __init__(self, exchange: str = 'XNYS'):
+        self.exchange = exchange
+        self.spec = EXCHANGES[exchange]
+
+    def sessions(self, start, end) -> pd.DataFrame:
+        start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+        df = pd.concat([_year(self.exchange, y) for y in range(start.year, end.year + 1)])
+        return df[(df.index >= start) & (df.index <= end)]
+
+    def label(self, index: pd.DatetimeIndex) -> pd.DataFrame:
+        """
+        UTC time, session_id (days since epoch of the trading day, -1 before the first
+        session), segment code and the session's regular open (UTC) per bar.
+        Bars between post close and the next pre open belong to the earlier
+        session as CLOSED.
+        """
+        utc = index.tz_convert('UTC') if index.tz is not None else index.tz_localize(self.spec['tz']).tz_convert('UTC')
+        sessions = self.sessions(utc.min() - pd.Timedelta(days=1), utc.max() + pd.Timedelta(days=1))
+
+        edges = np.column_stack([
+            sessions[c].to_numpy('datetime64[ns]').astype(np.int64)
+            for c in ('pre_open', 'open', 'close', 'post_close')
+        ]).ravel()
+        k = np.searchsorted(edges, utc.as_unit('ns').asi8, side='right') - 1
+
+        day = k // 4
+        segment = np.choose(k % 4, [PRE, REGULAR, POST, CLOSED])
+        valid = k >= 0
+        segment[~valid] = CLOSED
+
+        day_ordinal = (pd.DatetimeIndex(sessions.index).as_unit('s').asi8 // 86400).astype(np.int64)
+        session_id = np.where(valid, day_ordinal[np.maximum(day, 0)], -1)
+        session_open = np.where(valid, sessions['open'].to_numpy('datetime64[ns]')[np.maximum(day, 0)], np.datetime64('NaT'))
+
+        return pd.DataFrame({
+            'time': utc,
+            'session_id': session_id,
+            'segment': segment,
+            'session_open': pd.to_datetime(session_open, utc=True),
+        }, index=index)
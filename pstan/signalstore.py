@@ -0,0 +1,237 @@
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+
+# Boolean columns recorded as events, when present in a processed frame
+SIGNALS = ('Signal', 'ATR_break', 'MACD_buy_signal', 'HOD_break', 'OR_breakout', 'Boll_squeeze')
+
+# Metrics snapshotted with every event
+METRICS = ('Close', 'Volume_ratio', 'RSI')
+
+def _ns(t) -> int:
+    # Naive times are taken as UTC
+    t = pd.Timestamp(t)
+    return (t.tz_localize('UTC') if t.tzinfo is None else t).as_unit('ns').value
+
+def events_from_frame(df: pd.DataFrame, signals: Iterable[str] = SIGNALS, metrics: Iterable[str] = METRICS) -> pd.DataFrame:
+    """
+    Sparse (time, signal, metrics...) rows for every bar where a signal
+    column is True. Small and picklable, so workers can ship it back
+    instead of the whole frame.
+    """
+    signals = [s for s in signals if s in df]
+    metrics = [m for m in metrics if m in df]
+    times = pd.DatetimeIndex(pd.to_datetime(df.index, utc=True)).as_unit('ns').asi8
+
+    parts = []
+    for name in signals:
+        rows = np.flatnonzero(df[name].fillna(False).to_numpy(dtype=bool))
+        if not len(rows):
+            continue
+        part = {'time': times[rows], 'signal': name}
+        for m in metrics:
+            part[m] = df[m].to_numpy(dtype=np.float64)[rows]
+        parts.append(pd.DataFrame(part))
+
+    if not parts:
+        return pd.DataFrame(columns=['time', 'signal', *metrics])
+    return pd.concat(parts, ignore_index=True).sort_values('time', kind='stable', ignore_index=True)
+
+
+class SignalStore:
+    """
+    Append-only, in-memory store of signal events across a universe.
+
+    Symbols and signals are interned to small ints and events live in
+    growable column arrays. A dict of time buckets -> row numbers answers
+    "what fired in the last N minutes" by touching only the buckets in the
+    window. A per-symbol watermark, plus the signals already recorded at
+    it, makes repeated ingests of overlapping frames idempotent while a
+    signal that first fires on a later scan of the still-forming last bar
+    is still added.
+    """
+
+    def __init__(self, bucket: timedelta = timedelta(minutes=5), metrics: Iterable[str] = METRICS, capacity: int = 4096):
+        self.bucket_ns = int(bucket.total_seconds() * 1e9)
+        self.metrics = tuple(metrics)
+        self.symbols: list[str] = []
+        self.signals: list[str] = []
+        self._symbol_ids: dict[str, int] = {}
+        self._signal_ids: dict[str, int] = {}
+
+        self._n = 0
+        self._time = np.empty(capacity, dtype=np.int64)
+        self._symbol = np.empty(capacity, dtype=np.int32)
+        self._signal = np.empty(capacity, dtype=np.int16)
+        self._metrics = np.empty((capacity, len(self.metrics)), dtype=np.float64)
+
+        self._buckets: dict[int, list[int]] = defaultdict(list)
+        self._watermark: dict[int, int] = {}
+        self._at_watermark: dict[int, set[int]] = {}  # Signal ids recorded at the watermark time
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _intern(self, names: list[str], ids: dict[str, int], name: str) -> int:
+        if name not in ids:
+            ids[name] = len(names)
+            names.append(name)
+        return ids[name]
+
+    def _reserve(self, n: int) -> None:
+        capacity = len(self._time)
+        if self._n + n <= capacity:
+            return
+        capacity = max(capacity * 2, self._n + n)
+        self._time = np.resize(self._time, capacity)
+        self._symbol = np.resize(self._symbol, capacity)
+        self._signal = np.resize(self._signal, capacity)
+        self._metrics = np.resize(self._metrics, (capacity, len(self.metrics)))
+
+    def add_events(self, symbol: str, events: pd.DataFrame) -> int:
+        """Append rows from events_from_frame not recorded yet, by (time, signal) past the watermark"""
+        with self._lock:
+            sid = self._intern(self.symbols, self._symbol_ids, symbol)
+            times = events['time'].to_numpy(dtype=np.int64)
+            signals = np.array([self._intern(self.signals, self._signal_ids, s) for s in events['signal']], dtype=np.int16)
+            watermark = self._watermark.get(sid, np.iinfo(np.int64).min)
+            seen = self._at_watermark.get(sid, set())
+            new = (times > watermark) | ((times == watermark) & ~np.isin(signals, list(seen)))
+            if not new.any():
+                return 0
+
+            events = events[new]
+            times = times[new]
+            signals = signals[new]
+            n = len(events)
+            self._reserve(n)
+
+            a, b = self._n, self._n + n
+            self._time[a:b] = times
+            self._symbol[a:b] = sid
+            self._signal[a:b] = signals
+            for k, m in enumerate(self.metrics):
+                self._metrics[a:b, k] = events[m].to_numpy(dtype=np.float64) if m in events else np.nan
+
+            for row, bucket in enumerate((times // self.bucket_ns).tolist(), start=a):
+                self._buckets[bucket].append(row)
+
+            self._n = b
+            latest = int(times.max())
+            at_latest = set(signals[times == latest].tolist())
+            self._at_watermark[sid] = seen | at_latest if latest == watermark else at_latest
+            self._watermark[sid] = latest
+            return n
+
+    def ingest(self, symbol: str, df: pd.DataFrame, signals: Iterable[str] = SIGNALS) -> int:
+        """Record the signal events of a processed frame, returns events added"""
+        return self.add_events(symbol, events_from_frame(df, signals, self.metrics))
+
+    def _rows(self, since: Optional[int], until: Optional[int]) -> np.ndarray:
+        if since is None and until is None:
+            return np.arange(self._n)
+
+        lo = since // self.bucket_ns if since is not None else min(self._buckets, default=0)
+        hi = until // self.bucket_ns if until is not None else max(self._buckets, default=-1)
+        if hi - lo + 1 <= len(self._buckets):
+            keys = range(lo, hi + 1)
+        else:
+            keys = [k for k in self._buckets if lo <= k <= hi]
+
+        rows = [r for k in keys for r in self._buckets.get(k, ())]
+        return np.array(rows, dtype=np.int64)
+
+    def query(
+        self,
+        since: Optional[datetime | pd.Timestamp] = None,
+        until: Optional[datetime | pd.Timestamp] = None,
+        signals: Optional[Iterable[str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """Events with since <= time <= until, newest first"""
+        since_ns = _ns(since) if since is not None else None
+        until_ns = _ns(until) if until is not None else None
+
+        with self._lock:
+            rows = self._rows(since_ns, until_ns)
+            time = self._time[rows]
+            keep = np.ones(len(rows), dtype=bool)
+            if since_ns is not None:
+                keep &= time >= since_ns
+            if until_ns is not None:
+                keep &= time <= until_ns
+            if signals is not None:
+                ids = [self._signal_ids[s] for s in signals if s in self._signal_ids]
+                keep &= np.isin(self._signal[rows], ids)
+            if symbols is not None:
+                ids = [self._symbol_ids[s] for s in symbols if s in self._symbol_ids]
+                keep &= np.isin(self._symbol[rows], ids)
+
+            rows = rows[keep]
+            rows = rows[np.argsort(-self._time[rows], kind='stable')]
+            result = pd.DataFrame({
+                'time': pd.to_datetime(self._time[rows], unit='ns', utc=True),
+                'symbol': np.asarray(self.symbols, dtype=object)[self._symbol[rows]] if len(rows) else [],
+                'signal': np.asarray(self.signals, dtype=object)[self._signal[rows]] if len(rows) else [],
+                **{m: self._metrics[rows, k] for k, m in enumerate(self.metrics)},
+            })
+        return result
+
+    def recent(self, window: timedelta, now: Optional[datetime] = None, **filters) -> pd.DataFrame:
+        """Events in the last `window` before `now` (default: current time)"""
+        now = pd.Timestamp(now) if now is not None else pd.Timestamp.now(tz='UTC')
+        return self.query(since=now - window, until=now, **filters)
+
+    def fired(self, signal: str, window: timedelta, now: Optional[datetime] = None) -> list[str]:
+        """Symbols where `signal` fired within `window`, most recent first"""
+        events = self.recent(window, now, signals=[signal])
+        return list(dict.fromkeys(events['symbol']))
+
+    def save(self, path: str | Path) -> None:
+        with self._lock:
+            n = self._n
+            np.savez(
+                path,
+                time=self._time[:n], symbol=self._symbol[:n], signal=self._signal[:n], metrics=self._metrics[:n],
+                symbols=np.array(self.symbols, dtype=str), signals=np.array(self.signals, dtype=str),
+                metric_names=np.array(self.metrics, dtype=str), bucket_ns=self.bucket_ns,
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'SignalStore':
+        data = np.load(path)
+        store = cls(bucket=timedelta(microseconds=int(data['bucket_ns']) / 1e3), metrics=data['metric_names'].tolist())
+        store.symbols = data['symbols'].tolist()
+        store.signals = data['signals'].tolist()
+        store._symbol_ids = {s: i for i, s in enumerate(store.symbols)}
+        store._signal_ids = {s: i for i, s in enumerate(store.signals)}
+
+        n = len(data['time'])
+        store._reserve(n)
+        store._time[:n] = data['time']
+        store._symbol[:n] = data['symbol']
+        store._signal[:n] = data['signal']
+        store._metrics[:n] = data['metrics']
+        store._n = n
+        for row, bucket in enumerate((data['time'] // store.bucket_ns).tolist()):
+            store._buckets[bucket].append(row)
+        for sid in np.unique(store._symbol[:n]).tolist():
+            mine = store._symbol[:n] == sid
+            latest = int(store._time[:n][mine].max())
+            store._watermark[sid] = latest
+            store._at_watermark[sid] = set(store._signal[:n][mine & (store._time[:n] == latest)].tolist())
+        return store
+
+
+_signal_store: Optional[SignalStore] = None
+
+def get_signal_store() -> SignalStore:
+    global _signal_store
+    if _signal_store is None:
+        _signal_store = SignalStore()
+    return _signal_store
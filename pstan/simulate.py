@@ -0,0 +1,179 @@
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+from pstan.backtest import trade_stats
+
+SIM_TRADE_DTYPE = np.dtype([
+    ('symbol', np.int32),
+    ('entry_idx', np.int64),
+    ('exit_idx', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('shares', np.float64),
+    ('pnl', np.float64),
+    ('ret', np.float64),
+    ('win', np.bool_),
+])
+
+@dataclass
+class Panel:
+    """
+    Time-aligned [bars, symbols] arrays. Missing bars are NaN prices with
+    no signal, so one row is one timestamp across the whole universe.
+    """
+    index: pd.DatetimeIndex
+    symbols: list[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    signal: np.ndarray
+    rank: np.ndarray
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: dict[str, pd.DataFrame],
+        signal: str = 'Signal',
+        rank: Optional[str] = 'Volume_ratio',
+        dtype = np.float32,
+    ) -> 'Panel':
+        # Base leaves string indexes behind, parse everything to UTC
+        times = {s: pd.DatetimeIndex(pd.to_datetime(df.index, utc=True)).as_unit('ns') for s, df in frames.items()}
+        index = pd.to_datetime(np.unique(np.concatenate([t.asi8 for t in times.values()])), unit='ns', utc=True)
+        symbols = list(frames)
+        shape = (len(index), len(symbols))
+
+        arrays = {c: np.full(shape, np.nan, dtype=dtype) for c in ('Open', 'High', 'Low', 'Close', 'rank')}
+        sig = np.zeros(shape, dtype=bool)
+
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            rows = index.get_indexer(times[symbol])
+            for c in ('Open', 'High', 'Low', 'Close'):
+                arrays[c][rows, j] = df[c].to_numpy()
+            sig[rows, j] = df[signal].fillna(False).to_numpy(dtype=bool)
+            arrays['rank'][rows, j] = df[rank].to_numpy() if rank else 0
+
+        return cls(index, symbols, arrays['Open'], arrays['High'], arrays['Low'], arrays['Close'], sig, arrays['rank'])
+
+@dataclass
+class SimulationResult:
+    equity: pd.Series
+    trades: pd.DataFrame
+    stats: dict = field(default_factory=dict)
+
+
+def simulate(
+    panel: Panel,
+    initial_cash: float = 100_000,
+    max_positions: int = 10,
+    position_pct: float = 0.1,
+    stop_loss_pct: float = 0.02,
+    profit_ratio: float = 1.5,
+    fee_pct: float = 0.0,
+) -> SimulationResult:
+    """
+    Shared-capital, long-only simulation over a Panel.
+
+    Bars are processed in time order: exits first (stop/target against the
+    bar's Low/High, gaps fill at the Open, stop wins ties), then entries at
+    the close for signalled symbols not already held, best `rank` first,
+    each sized at `position_pct` of current equity and capped by cash and
+    `max_positions`. Stretches with no open positions and no signals are
+    skipped entirely.
+    """
+    n_bars, n_symbols = panel.close.shape
+    take_profit_pct = stop_loss_pct * profit_ratio
+
+    signal_bars = np.flatnonzero(panel.signal.any(axis=1))
+    equity = np.full(n_bars, np.nan)
+
+    cash = float(initial_cash)
+    held = np.zeros(n_symbols, dtype=bool)
+    shares = np.zeros(n_symbols)
+    entry_price = np.zeros(n_symbols)
+    entry_idx = np.zeros(n_symbols, dtype=np.int64)
+    stop = np.zeros(n_symbols)
+    target = np.zeros(n_symbols)
+    cost = np.zeros(n_symbols)  # cash spent on the position, fees included
+    mark = np.zeros(n_symbols)  # last known close of held symbols
+
+    trades = []
+    t = 0
+    while t < n_bars:
+        if not held.any():
+            # Nothing to manage until the next signal
+            k = np.searchsorted(signal_bars, t)
+            if k == len(signal_bars):
+                break
+            equity[t:signal_bars[k]] = cash
+            t = int(signal_bars[k])
+
+        # --- Exits ---
+        pos = np.flatnonzero(held)
+        if len(pos):
+            low, high, opens = panel.low[t, pos], panel.high[t, pos], panel.open[t, pos]
+            hit_stop = low <= stop[pos]
+            hit_target = ~hit_stop & (high >= target[pos])
+
+            for hit, level, gap in ((hit_stop, stop, np.minimum), (hit_target, target, np.maximum)):
+                if not hit.any():
+                    continue
+                exits = pos[hit]
+                price = level[exits]
+                gapped = ~np.isnan(opens[hit])
+                price[gapped] = gap(price[gapped], opens[hit][gapped])
+
+                proceeds = shares[exits] * price * (1 - fee_pct)
+                cash += proceeds.sum()
+                for s, p, q in zip(exits, price, proceeds):
+                    trades.append((s, entry_idx[s], t, entry_price[s], p, shares[s], q - cost[s], p / entry_price[s] - 1, p > entry_price[s]))
+                held[exits] = False
+                shares[exits] = 0
+
+            close = panel.close[t, pos]
+            valid = ~np.isnan(close)
+            mark[pos[valid]] = close[valid]
+
+        # --- Entries ---
+        free = max_positions - int(held.sum())
+        if free > 0 and panel.signal[t].any():
+            candidates = np.flatnonzero(panel.signal[t] & ~held & ~np.isnan(panel.close[t]))
+            if len(candidates) > free:
+                order = np.argsort(-np.nan_to_num(panel.rank[t, candidates], nan=-np.inf), kind='stable')
+                candidates = candidates[order[:free]]
+
+            value = cash + (shares * mark).sum()
+            for s in candidates:
+                price = float(panel.close[t, s])
+                budget = min(value * position_pct, cash)
+                if budget <= 0:
+                    break
+                cash -= budget
+                cost[s] = budget
+                held[s] = True
+                shares[s] = budget * (1 - fee_pct) / price
+                entry_price[s] = price
+                entry_idx[s] = t
+                stop[s] = price * (1 - stop_loss_pct)
+                target[s] = price * (1 + take_profit_pct)
+                mark[s] = price
+
+        equity[t] = cash + (shares * mark).sum()
+        t += 1
+
+    equity = pd.Series(equity, index=panel.index).ffill().fillna(initial_cash)
+
+    trades = np.array(trades, dtype=SIM_TRADE_DTYPE)
+    stats = trade_stats(trades, equity.to_numpy(), initial_cash)
+    stats['open_positions'] = int(held.sum())
+
+    trades = pd.DataFrame(trades)
+    trades['symbol'] = np.asarray(panel.symbols, dtype=object)[trades['symbol']] if len(trades) else []
+    trades['entry_time'] = panel.index[trades['entry_idx']]
+    trades['exit_time'] = panel.index[trades['exit_idx']]
+
+    return SimulationResult(equity=equity, trades=trades, stats=stats)
@@ -0,0 +1,190 @@
+import functools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterable, Optional
+
+# Prometheus' default latency buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{n}="{str(v)}"' for n, v in zip(names, values))
+    return '{' + pairs + '}'
+
+def _number(v: float) -> str:
+    if math.isinf(v):
+        return '+Inf' if v > 0 else '-Inf'
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        """(name suffix, label string, value) triples"""
+        return ()
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(f'{self.name}{suffix}{labels} {_number(value)}' for suffix, labels, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [('', _labels(self.labelnames, k), v) for k, v in self._values.items()]
+
+
+class Gauge(Metric):
+    """Set directly, or read from `fn` (label tuple -> value) at scrape time"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), fn: Optional[Callable[[], dict[tuple, float]]] = None):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, *labels) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def samples(self):
+        values = self.fn() if self.fn is not None else self._values
+        with self._lock:
+            return [('', _labels(self.labelnames, k), v) for k, v in values.items()]
+
+
+class CallbackCounter(Gauge):
+    """A counter kept elsewhere (cache hits...), read at scrape time"""
+    kind = 'counter'
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple, list] = {}  # labels -> [counts per bucket..., sum, count]
+
+    def observe(self, value: float, *labels) -> None:
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, *labels):
+        """Context manager observing the block's wall time; a no-op when metrics are off"""
+        if not REGISTRY.enabled:
+            return nullcontext()
+        return self._timer(labels)
+
+    @contextmanager
+    def _timer(self, labels: tuple):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for labels, state in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    samples.append(('_bucket', _labels(self.labelnames + ('le',), labels + (_number(bound),)), cumulative))
+                samples.append(('_bucket', _labels(self.labelnames + ('le',), labels + ('+Inf',)), state[-1]))
+                samples.append(('_sum', _labels(self.labelnames, labels), state[-2]))
+                samples.append(('_count', _labels(self.labelnames, labels), state[-1]))
+        return samples
+
+
+class Registry:
+    """
+    Metrics rendered in the Prometheus text format. Instrumented code checks
+    `enabled` before timing anything, so when metrics are off a hook costs
+    one attribute lookup.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        # Re-registering (module reloads) keeps the first instance
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = (), fn: Optional[Callable[[], dict[tuple, float]]] = None) -> Gauge:
+        return self.register(Gauge(name, help, labelnames, fn))
+
+    def callback_counter(self, name: str, help: str, labelnames: Iterable[str], fn: Callable[[], dict[tuple, float]]) -> CallbackCounter:
+        return self.register(CallbackCounter(name, help, labelnames, fn))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry(enabled=os.environ.get('PSTAN_METRICS', '') not in ('', '0', 'false'))
+
+def enable(enabled: bool = True) -> None:
+    REGISTRY.enabled = enabled
+
+
+# --- Library metrics
+
+PROCESS_SECONDS = REGISTRY.histogram('pstan_process_seconds', 'Processor process() time', ['processor'])
+PROCESS_ROWS = REGISTRY.counter('pstan_process_rows_total', 'Rows through processor process()', ['processor'])
+FETCH_SECONDS = REGISTRY.histogram('pstan_fetch_seconds', 'Data fetch latency', ['provider'], buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+
+def timed_fetch(provider: str):
+    """Decorator recording a fetcher's latency under FETCH_SECONDS{provider}"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                FETCH_SECONDS.observe(time.perf_counter() - start, provider)
+        return wrapper
+    return decorator
@@ -1,5 +1,8 @@
+import time
 import pandas as pd
-from typing import Any
+from typing import Any, Optional
+from pstan.utils import metrics
+from pstan.utils.profiler import Profiler
 
 class dotdict(dict):
     """dot.access to dictionary attributes"""
@@ -12,6 +15,18 @@ class dotdict(dict):
     def __delattr__(self, key: str) -> None:
         del self[key]
 
-def pipe(df: pd.DataFrame, **processors: Any) -> tuple[pd.DataFrame, Any]:
-    for p in processors.values(): df = p.process(df)
+def pipe(df: pd.DataFrame, profiler: Optional[Profiler] = None, **processors: Any) -> tuple[pd.DataFrame, Any]:
+    enabled = metrics.REGISTRY.enabled
+    if profiler is None and not enabled:
+        for p in processors.values(): df = p.process(df)
+        return df, dotdict(processors)
+
+    # Profiled runs are counted in the metrics too (timed with the profiler's overhead)
+    for key, p in processors.items():
+        name = type(p).__name__
+        start = time.perf_counter()
+        df = p.process(df) if profiler is None else profiler.run(key, p, df)
+        if enabled:
+            metrics.PROCESS_SECONDS.observe(time.perf_counter() - start, name)
+            metrics.PROCESS_ROWS.inc(len(df), name)
     return df, dotdict(processors)
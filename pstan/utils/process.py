@@ -25,3 +25,28 @@ def normalize_signed(series):
     max_abs = max(abs(s.min()), abs(s.max()))
     return series / max_abs  # scales to [-1, 1]
 
+
+
+# --- Segmented scans ---
+# `ids` label contiguous segments (e.g. session ids of time-ordered bars);
+# every scan restarts at a segment boundary and runs in O(n)
+
+def segment_starts(ids) -> np.ndarray:
+    ids = np.asarray(ids)
+    starts = np.ones(len(ids), dtype=bool)
+    starts[1:] = ids[1:] != ids[:-1]
+    return starts
+
+def segmented_cumsum(values, ids) -> np.ndarray:
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    total = np.cumsum(values)
+    starts = np.flatnonzero(segment_starts(ids))
+    # Subtract the running total reached before each segment
+    offset = total[starts] - values[starts]
+    return total - np.repeat(offset, np.diff(np.append(starts, len(values))))
+
+def segmented_cummax(values, ids) -> np.ndarray:
+    return pd.Series(values, dtype=np.float64).groupby(np.cumsum(segment_starts(ids)), sort=False).cummax().to_numpy()
+
+def segmented_cummin(values, ids) -> np.ndarray:
+    return pd.Series(values, dtype=np.float64).groupby(np.cumsum(segment_starts(ids)), sort=False).cummin().to_numpy()
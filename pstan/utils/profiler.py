@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Optional
+import pandas as pd
+
+class _Clock:
+    """Splits a processor's time between the columns it assigns"""
+
+    def __init__(self):
+        self.last = time.perf_counter_ns()
+        self.columns: list[tuple[str, int, int]] = []
+
+    def tick(self, column: Any) -> None:
+        now = time.perf_counter_ns()
+        self.columns.append((str(column), self.last, now))
+        self.last = now
+
+class TimedFrame(pd.DataFrame):
+    """
+    DataFrame whose column assignments report to a clock: everything since
+    the previous assignment (computing the right-hand side included) is
+    charged to the column being set. Survives copy(); a processor that
+    builds a new plain frame stops the attribution for the rest of it.
+    """
+    _metadata = ['_clock']
+
+    @property
+    def _constructor(self):
+        return TimedFrame
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        clock = getattr(self, '_clock', None)
+        if clock is not None:
+            clock.tick(key)
+
+
+# Runs currently measuring memory. tracemalloc and its peak are process-wide,
+# so the first run starts tracing, the last stops it, and a peak is only
+# reported when no other run overlapped it
+_tracing_lock = threading.Lock()
+_tracers = 0
+_generation = 0
+_owned = False
+
+def _start_tracing() -> int:
+    global _tracers, _generation, _owned
+    with _tracing_lock:
+        if _tracers == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owned = True
+        _tracers += 1
+        _generation += 1
+        if _tracers == 1:
+            tracemalloc.reset_peak()
+        return _generation if _tracers == 1 else -1
+
+def _stop_tracing(generation: int, traced: int) -> Optional[int]:
+    """Peak above `traced` since _start_tracing(), None if another run overlapped"""
+    global _tracers, _owned
+    with _tracing_lock:
+        peak = tracemalloc.get_traced_memory()[1] - traced if generation == _generation else None
+        _tracers -= 1
+        if _tracers == 0 and _owned:
+            tracemalloc.stop()
+            _owned = False
+        return peak
+
+
+class Profiler:
+    """
+    Per-processor measurements for pipe(df, profiler=...): wall and CPU
+    time, tracemalloc peak above the starting point, columns added and
+    bytes the frame grew by. With `columns`, also per-column wall time
+    through TimedFrame.
+
+    tracemalloc is process-wide and slows allocation-heavy code down
+    noticeably. Peaks are only reported (otherwise None) for runs no
+    other thread's run overlapped, so measure memory with serial or
+    process scans. Turn `memory` off for timing-only runs.
+    """
+
+    def __init__(self, memory: bool = True, columns: bool = False):
+        self.memory = memory
+        self.columns = columns
+        self.spans: list[dict] = []
+
+    def _span(self, name: str, cat: str, start: int, end: int, **args) -> dict:
+        span = {
+            'name': name, 'cat': cat, 'start': start, 'end': end,
+            'pid': os.getpid(), 'tid': threading.get_native_id(), 'args': args,
+        }
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'stage', **args):
+        """Time any block (fetch, ranking...) into the same trace"""
+        start = time.perf_counter_ns()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self._span(name, cat, start, time.perf_counter_ns(), cpu=time.thread_time() - cpu, **args)
+
+    def run(self, name: str, processor: Any, df: pd.DataFrame, **args) -> pd.DataFrame:
+        """df = processor.process(df), measured"""
+        before_columns = set(df.columns)
+        before_bytes = int(df.memory_usage(index=False).sum())
+
+        clock = None
+        if self.columns:
+            clock = _Clock()
+            df = TimedFrame(df)
+            df._clock = clock
+
+        peak = None
+        if self.memory:
+            generation = _start_tracing()
+            traced = tracemalloc.get_traced_memory()[0]
+        try:
+            start = time.perf_counter_ns()
+            cpu = time.thread_time()
+            df = processor.process(df)
+            cpu = time.thread_time() - cpu
+            end = time.perf_counter_ns()
+        finally:
+            if self.memory:
+                peak = _stop_tracing(generation, traced)
+        if isinstance(df, TimedFrame):
+            df = pd.DataFrame(df)
+
+        self._span(
+            name, 'processor', start, end,
+            processor=type(processor).__name__, cpu=cpu, peak_bytes=peak,
+            columns_added=len(set(df.columns) - before_columns),
+            frame_bytes=int(df.memory_usage(index=False).sum()) - before_bytes,
+            rows=len(df), **args,
+        )
+        if clock is not None:
+            for column, a, b in clock.columns:
+                self._span(column, 'column', a, b, processor=type(processor).__name__, **args)
+        return df
+
+    def extend(self, spans: Iterable[dict]) -> None:
+        """Merge spans recorded by another Profiler (e.g. in a worker process)"""
+        self.spans.extend(spans)
+
+    def summary(self, cat: str = 'processor') -> pd.DataFrame:
+        """Totals per processor (or per column with cat='column'), slowest first"""
+        spans = [s for s in self.spans if s['cat'] == cat]
+        if not spans:
+            return pd.DataFrame()
+        df = pd.DataFrame([{'name': s['name'], 'wall': (s['end'] - s['start']) / 1e9, **s['args']} for s in spans])
+        agg = {c: 'max' if c == 'peak_bytes' else 'sum' for c in df.select_dtypes('number').columns}
+        table = df.groupby('name').agg(agg)
+        table.insert(0, 'calls', df.groupby('name').size())
+        return table.sort_values('wall', ascending=False)
+
+    def to_chrome_trace(self, path: Optional[str | Path] = None) -> dict:
+        """
+        Trace Event Format (chrome://tracing, Perfetto, speedscope): one
+        complete event per span, in microseconds from the first span.
+        """
+        origin = min((s['start'] for s in self.spans), default=0)
+        events = [
+            {
+                'name': s['name'], 'cat': s['cat'], 'ph': 'X',
+                'ts': (s['start'] - origin) / 1e3, 'dur': (s['end'] - s['start']) / 1e3,
+                'pid': s['pid'], 'tid': s['tid'],
+                'args': {k: v for k, v in s['args'].items() if v is not None},
+            }
+            for s in self.spans
+        ]
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            Path(path).write_text(json.dumps(trace))
+        return trace
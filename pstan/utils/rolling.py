@@ -0,0 +1,174 @@
+import heapq
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Optional
+import numpy as np
+
+# Rolling order statistics that update in O(log w) per bar. Each class takes
+# one value at a time through update(), so the same object serves a batch
+# pass over history and a live feed appending bars as they close. NaNs take
+# a slot in the window but are not counted, and results stay NaN until
+# `min_periods` valid values are in the window (pandas semantics).
+
+class RollingQuantile:
+    """
+    Two heaps with lazy deletion: `lo` (max-heap) holds the k smallest
+    values of the window, `hi` the rest, so the q-quantile is read from the
+    two tops. Expired values are only marked and dropped once they surface;
+    on trending input most never do, so once more than `window` are pending
+    both heaps are rebuilt from the window, keeping them O(w).
+    """
+
+    def __init__(self, window: int, q: float = 0.5, min_periods: Optional[int] = None):
+        self.window = window
+        self.q = q
+        self.min_periods = window if min_periods is None else min_periods
+        self._lo: list[tuple[float, int]] = []  # (-value, -i)
+        self._hi: list[tuple[float, int]] = []  # (value, i)
+        self._lo_n = 0
+        self._hi_n = 0
+        self._expired: set[int] = set()
+        self._values: deque[float] = deque()
+        self._i = 0
+
+    def _prune(self, heap: list, sign: int) -> None:
+        while heap and sign * heap[0][1] in self._expired:
+            self._expired.discard(sign * heapq.heappop(heap)[1])
+
+    def _lo_top(self) -> tuple[float, int]:
+        self._prune(self._lo, -1)
+        value, i = self._lo[0]
+        return -value, -i
+
+    def _hi_top(self) -> tuple[float, int]:
+        self._prune(self._hi, 1)
+        return self._hi[0]
+
+    def _compact(self) -> None:
+        first = self._i - len(self._values)
+        live = sorted((x, first + k) for k, x in enumerate(self._values) if not math.isnan(x))
+        self._lo = [(-x, -i) for x, i in live[:self._lo_n]]
+        self._hi = live[self._lo_n:]
+        heapq.heapify(self._lo)  # _hi is already sorted, so already a heap
+        self._expired.clear()
+
+    def update(self, x: float) -> float:
+        i = self._i
+        self._i += 1
+        self._values.append(x)
+
+        if not math.isnan(x):
+            if self._lo_n and (x, i) <= self._lo_top():
+                heapq.heappush(self._lo, (-x, -i))
+                self._lo_n += 1
+            else:
+                heapq.heappush(self._hi, (x, i))
+                self._hi_n += 1
+
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            j = i - self.window
+            if not math.isnan(old):
+                if self._lo_n and (old, j) <= self._lo_top():
+                    self._lo_n -= 1
+                else:
+                    self._hi_n -= 1
+                self._expired.add(j)
+                if len(self._expired) > self.window:
+                    self._compact()
+
+        return self.value()
+
+    def value(self) -> float:
+        n = self._lo_n + self._hi_n
+        if n < max(self.min_periods, 1):
+            return np.nan
+
+        # Keep exactly the k lowest values in `lo`
+        pos = self.q * (n - 1)
+        k = int(pos) + 1
+        while self._lo_n > k:
+            value, i = self._lo_top()
+            heapq.heappop(self._lo)
+            heapq.heappush(self._hi, (value, i))
+            self._lo_n -= 1
+            self._hi_n += 1
+        while self._lo_n < k:
+            value, i = self._hi_top()
+            heapq.heappop(self._hi)
+            heapq.heappush(self._lo, (-value, -i))
+            self._hi_n -= 1
+            self._lo_n += 1
+
+        # Linear interpolation between the k-th and (k+1)-th values
+        lower = self._lo_top()[0]
+        frac = pos - (k - 1)
+        if frac == 0 or not self._hi_n:
+            return lower
+        return lower + frac * (self._hi_top()[0] - lower)
+
+
+class SortedWindow:
+    """
+    Sorted copy of the window kept with bisect, for percentile ranks and
+    any number of quantiles of the window. Search is O(log w); insert and
+    delete are a memmove of at most w floats.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._sorted: list[float] = []
+        self._values: deque[float] = deque()
+
+    def push(self, x: float) -> None:
+        self._values.append(x)
+        if not math.isnan(x):
+            insort(self._sorted, x)
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if not math.isnan(old):
+                del self._sorted[bisect_left(self._sorted, old)]
+
+    def update(self, x: float) -> float:
+        """Add a value and return its percentile rank in the window"""
+        self.push(x)
+        return self.rank(x)
+
+    def rank(self, x: float) -> float:
+        """Average rank of x in the window as a fraction, like rank(pct=True)"""
+        n = len(self._sorted)
+        if n < max(self.min_periods, 1) or math.isnan(x):
+            return np.nan
+        less = bisect_left(self._sorted, x)
+        equal = bisect_right(self._sorted, x) - less
+        return (less + (equal + 1) / 2) / n
+
+    def quantile(self, q: float) -> float:
+        n = len(self._sorted)
+        if n < max(self.min_periods, 1):
+            return np.nan
+        pos = q * (n - 1)
+        k = int(pos)
+        if k + 1 >= n:
+            return self._sorted[k]
+        return self._sorted[k] + (pos - k) * (self._sorted[k + 1] - self._sorted[k])
+
+
+def rolling_quantile(values, window: int, q: float = 0.5, min_periods: Optional[int] = None) -> np.ndarray:
+    # For indicator-sized windows the memmove of the sorted list beats heap
+    # churn in pure Python; RollingQuantile pays off for long live windows
+    state = SortedWindow(window, min_periods)
+    out = np.empty(len(values))
+    for k, x in enumerate(np.asarray(values, dtype=np.float64).tolist()):
+        state.push(x)
+        out[k] = state.quantile(q)
+    return out
+
+def rolling_median(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    return rolling_quantile(values, window, 0.5, min_periods)
+
+def rolling_rank(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    state = SortedWindow(window, min_periods)
+    return np.fromiter((state.update(x) for x in np.asarray(values, dtype=np.float64).tolist()), dtype=np.float64, count=len(values))
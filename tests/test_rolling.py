@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from pstan.utils.rolling import RollingQuantile
+
+
+def test_rolling_quantile_matches_pandas():
+    values = np.random.default_rng(0).normal(size=2000)
+    values[::37] = np.nan
+    for q in (0.1, 0.5, 0.9):
+        state = RollingQuantile(25, q, min_periods=5)
+        got = np.array([state.update(x) for x in values])
+        expected = pd.Series(values).rolling(25, min_periods=5).quantile(q).to_numpy()
+        np.testing.assert_allclose(got, expected, equal_nan=True)
+
+
+def test_rolling_quantile_heaps_stay_bounded_on_trends():
+    for values in (np.arange(100_000.0), -np.arange(100_000.0)):
+        state = RollingQuantile(10)
+        for x in values:
+            state.update(x)
+        assert len(state._lo) + len(state._hi) <= 2 * state.window + 1
+        assert len(state._expired) <= state.window
+        assert state.value() == np.median(values[-10:])